@@ -0,0 +1,211 @@
+"""
+Meklēšanas algoritmu salīdzinājums.
+
+Visi algoritmi no ENGINES tiek palaisti uz fiksēta virkņu korpusa
+(garumi MIN_LEN..MAX_LEN, katram --per-length virknes no fiksēta seed) ar
+dziļumiem 1..--max-depth. Katram algoritmam un dziļumam tiek pierakstītas
+apmeklētās virsotnes, laiks, lielākā atmiņa (tracemalloc) un izvēlētie gājieni.
+Visiem algoritmiem vienā pozīcijā un dziļumā jāiegūst vienāda vērtība.
+
+Ar --save-baseline rezultātus saglabā; bez tā salīdzina ar saglabātajiem un
+beidzas ar kodu 1, ja virsotņu skaits vai laiks pieaudzis vairāk par pielaidi.
+Virsotņu skaits ir deterministisks, tāpēc tas glabājas repozitorijā
+(benchmark_baseline.json); laiks un atmiņa atkarīgi no datora un glabājas tikai
+lokāli (benchmark_timings.json). Ja virsotņu bāzes nav, beidzas ar kodu 1.
+
+Lietošana:
+    python benchmark.py --max-depth 5 --save-baseline
+    python benchmark.py --max-depth 5
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from engine import (
+    AI, MAX_LEN, MIN_LEN, MoveOrdering, SearchStats, TranspositionTable,
+    _numpy, alpha_beta, batched_search, find_count_move, generate_count_moves, minimax, to_counts,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+TIMINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_timings.json")
+
+def _minimax(state, depth, stats):
+    value, best_state = minimax(state, depth, True, None, generate_count_moves, stats)
+    return value, find_count_move(state, best_state)
+
+def _alpha_beta(state, depth, stats):
+    value, best_state = alpha_beta(state, depth, -999999, 999999, True, None, generate_count_moves,
+                                   stats=stats)
+    return value, find_count_move(state, best_state)
+
+def _alpha_beta_ordering(state, depth, stats):
+    # Tikai gājienu kārtošana (bez transpozīciju tabulas), lai tās ieguvums būtu redzams atsevišķi
+    value, best_state = alpha_beta(state, depth, -999999, 999999, True, None, generate_count_moves,
+                                   ordering=MoveOrdering(), stats=stats)
+    return value, find_count_move(state, best_state)
+
+def _alpha_beta_tt(state, depth, stats):
+    value, best_state = alpha_beta(state, depth, -999999, 999999, True, TranspositionTable(1 << 12),
+                                   generate_count_moves, ordering=MoveOrdering(), stats=stats)
+    return value, find_count_move(state, best_state)
+
+def _pvs(state, depth, stats):
+    value, best_state = alpha_beta(state, depth, -999999, 999999, True, TranspositionTable(1 << 12),
+                                   generate_count_moves, ordering=MoveOrdering(), stats=stats, pvs=True)
+    return value, find_count_move(state, best_state)
+
+def _batched(state, depth, stats):
+    # Korpusā sāk datoram ar 0:0, tāpēc relatīvā vērtība sakrīt ar ai_score - human_score
+    value, pv = batched_search(state[0], depth, stats)
+    return value, pv[0] if pv else None
+
+# Algoritmi, kurus salīdzina: nosaukums -> f(stāvoklis, dziļums, stats) -> (vērtība, labākais_gājiens)
+ENGINES = {
+    "minimax": _minimax,
+    "alpha_beta": _alpha_beta,
+    "alpha_beta_ordering": _alpha_beta_ordering,
+    "alpha_beta_tt": _alpha_beta_tt,
+    "pvs": _pvs,
+}
+# batched_search vajag NumPy; bez tā salīdzina tikai pārējos algoritmus
+if _numpy() is not None:
+    ENGINES["batched"] = _batched
+
+def build_corpus(per_length):
+    """Fiksētas sākuma virknes: per_length virknes katram garumam MIN_LEN..MAX_LEN."""
+    corpus = []
+    for length in range(MIN_LEN, MAX_LEN + 1):
+        for i in range(per_length):
+            rng = random.Random(length * 1000 + i)
+            corpus.append(tuple(rng.randint(1, 4) for _ in range(length)))
+    return corpus
+
+def run_engine(engine, state, depth):
+    """
+    Palaiž algoritmu divreiz: vienreiz laika mērīšanai (bez atkritumu savācēja,
+    lai tas nesabojātu mērījumu), vienreiz ar tracemalloc.
+    """
+    stats = SearchStats()
+    gc.collect()
+    gc.disable()
+    start = time.perf_counter()
+    value, move = engine(state, depth, stats)
+    elapsed = time.perf_counter() - start
+    gc.enable()
+
+    tracemalloc.start()
+    engine(state, depth, SearchStats())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, move, stats.nodes, elapsed, peak
+
+def run_benchmark(corpus, max_depth, engines=ENGINES):
+    """
+    Atgriež (kopsavilkums, nesakritības).
+    kopsavilkums: {"dzinējs/dziļums": {"nodes", "time", "peak_kb", "moves"}}
+    nesakritības: saraksts ar pozīcijām, kur algoritmu vērtības atšķiras.
+    """
+    summary = {}
+    mismatches = []
+    for depth in range(1, max_depth + 1):
+        for numbers in corpus:
+            state = (to_counts(numbers), 0, 0, AI)
+            values = {}
+            for name, engine in engines.items():
+                value, move, nodes, elapsed, peak = run_engine(engine, state, depth)
+                values[name] = value
+                row = summary.setdefault(f"{name}/{depth}",
+                                         {"nodes": 0, "time": 0.0, "peak_kb": 0, "moves": []})
+                row["nodes"] += nodes
+                row["time"] += elapsed
+                row["peak_kb"] = max(row["peak_kb"], peak // 1024)
+                row["moves"].append(f"{move[0]} {move[1]}" if move else None)
+            if len(set(values.values())) > 1:
+                mismatches.append({"numbers": numbers, "depth": depth, "values": values})
+    return summary, mismatches
+
+def split_summary(summary):
+    """Sadala kopsavilkumu deterministiskajā daļā (virsotnes, gājieni) un laikos (laiks, atmiņa)."""
+    nodes = {key: {"nodes": row["nodes"], "moves": row["moves"]} for key, row in summary.items()}
+    timings = {key: {"time": row["time"], "peak_kb": row["peak_kb"]} for key, row in summary.items()}
+    return nodes, timings
+
+def find_regressions(summary, baseline, timings, node_tolerance, time_tolerance, min_time):
+    """
+    Atgriež aprakstus rindām, kur virsotnes vai laiks pārsniedz bāzi vairāk par pielaidi.
+    Laika pieaugumu, kas mazāks par min_time sekundēm, neuzskata par regresiju (troksnis).
+    """
+    regressions = []
+    for key, row in summary.items():
+        base = baseline.get(key)
+        if base is not None and row["nodes"] > base["nodes"] * (1 + node_tolerance):
+            regressions.append(f"{key}: virsotnes {base['nodes']} -> {row['nodes']}")
+        base = timings.get(key)
+        if base is not None and row["time"] > base["time"] * (1 + time_tolerance) \
+                and row["time"] - base["time"] > min_time:
+            regressions.append(f"{key}: laiks {base['time']:.3f} s -> {row['time']:.3f} s")
+    return regressions
+
+def print_summary(summary):
+    print(f"{'algoritms/dziļums':<24}{'virsotnes':>12}{'laiks, s':>12}{'atmiņa, KB':>12}")
+    for key, row in summary.items():
+        print(f"{key:<24}{row['nodes']:>12}{row['time']:>12.3f}{row['peak_kb']:>12}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Salīdzina meklēšanas algoritmus uz fiksēta korpusa.")
+    parser.add_argument("--max-depth", type=int, default=4, help="lielākais meklēšanas dziļums")
+    parser.add_argument("--per-length", type=int, default=3, help="virkņu skaits katram garumam")
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=sorted(ENGINES),
+                        help="kurus algoritmus salīdzināt")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="virsotņu bāzes fails")
+    parser.add_argument("--timings", default=TIMINGS_PATH, help="lokālais laiku bāzes fails")
+    parser.add_argument("--save-baseline", action="store_true", help="saglabāt rezultātus kā bāzi")
+    parser.add_argument("--node-tolerance", type=float, default=0.0,
+                        help="pieļaujamais virsotņu pieaugums (0.1 = 10%%)")
+    parser.add_argument("--time-tolerance", type=float, default=0.5,
+                        help="pieļaujamais laika pieaugums (0.5 = 50%%)")
+    parser.add_argument("--min-time", type=float, default=0.05,
+                        help="mazāku laika pieaugumu (s) neuzskata par regresiju")
+    args = parser.parse_args()
+
+    engines = {name: ENGINES[name] for name in args.engines}
+    summary, mismatches = run_benchmark(build_corpus(args.per_length), args.max_depth, engines)
+    print_summary(summary)
+
+    failed = False
+    for m in mismatches:
+        print(f"NESAKRĪT: {m['numbers']} dziļums {m['depth']}: {m['values']}", file=sys.stderr)
+        failed = True
+
+    if args.save_baseline:
+        nodes, timings = split_summary(summary)
+        for path, data in ((args.baseline, nodes), (args.timings, timings)):
+            with open(path, "w") as f:
+                json.dump(data, f, indent=1)
+        print(f"Bāze saglabāta: {args.baseline}, {args.timings}")
+    elif not os.path.exists(args.baseline):
+        print(f"Nav virsotņu bāzes {args.baseline}; izveido to ar --save-baseline", file=sys.stderr)
+        failed = True
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        timings = {}
+        if os.path.exists(args.timings):
+            with open(args.timings) as f:
+                timings = json.load(f)
+        else:
+            print(f"Nav laiku bāzes {args.timings}; salīdzina tikai virsotnes", file=sys.stderr)
+        for line in find_regressions(summary, baseline, timings, args.node_tolerance,
+                                     args.time_tolerance, args.min_time):
+            print(f"REGRESIJA: {line}", file=sys.stderr)
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
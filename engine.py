@@ -0,0 +1,1805 @@
+"""
+Spēles loģika un datora algoritmi bez pygame.
+
+Šo moduli izmanto spele.py (logs) un visi rīki (tablebase.py, selfplay.py,
+benchmark.py, ...). Tas neimportē pygame un NumPy importē tikai tad, kad
+tas pirmo reizi vajadzīgs, tāpēc imports aizņem dažas milisekundes.
+"""
+import os
+import math
+import mmap
+import struct
+import time
+
+# NumPy imports aizņem ap 0,1 s, tāpēc to importē tikai batched_search un
+# Evaluator.score_batch (skatīt _numpy). Bez NumPy strādā viss pārējais.
+# Tā paša iemesla dēļ json (kopā ar re) tiek importēts tikai funkcijās,
+# kas lasa vai raksta failus, un random - tikai MCTS.
+np = None
+_numpy_missing = False
+
+def _numpy():
+    """Importē NumPy pirmajā izsaukumā; atgriež moduli vai None, ja tā nav."""
+    global np, _numpy_missing
+    if np is None and not _numpy_missing:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            _numpy_missing = True
+    return np
+
+# Spēlētāji
+HUMAN = 0
+AI = 1
+
+# Datora algoritmi
+ALGO_MINIMAX = "MINIMAX"
+ALGO_ALPHA_BETA = "ALPHA_BETA"
+ALGO_EXACT = "EXACT"
+ALGO_PARALLEL = "PARALLEL"
+ALGO_MCTS = "MCTS"
+
+ALGO_NAMES = {
+    ALGO_MINIMAX: "Minimax",
+    ALGO_ALPHA_BETA: "Alpha-Beta",
+    ALGO_EXACT: "Precīzs",
+    ALGO_PARALLEL: "Paralēlais Alpha-Beta",
+    ALGO_MCTS: "MCTS",
+}
+
+# Atļautais virknes garums (MAX_LEN - rīkiem un tabulām; izvēlnē var izvēlēties
+# līdz LONG_MAX_LEN, garām virknēm precīzais algoritms izmanto reduce_pairs)
+MIN_LEN = 15
+MAX_LEN = 20
+LONG_MAX_LEN = 2000
+
+# Iepriekš izrēķinātā galotņu tabula (veido ar tablebase.py)
+TABLEBASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebase.bin")
+
+# Heiristiskā novērtējuma svari (veido ar tune_eval.py)
+EVALUATOR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "evaluator.json")
+
+# Atklātņu grāmata pirmajiem gājieniem (veido ar opening_book.py)
+OPENING_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.json")
+
+# -----------------------------
+# Loģikas funkcijas
+# -----------------------------
+
+def is_game_over(numbers):
+    """
+    Pārbaudām, vai virkne ir tukša (vai spēle ir beigusies).
+    Der gan skaitļu virknei, gan skaitu vektoram (c1, c2, c3, c4),
+    jo virknē visi skaitļi ir >= 1.
+    """
+    return not any(numbers)
+
+def evaluate(human_score, ai_score):
+    """
+    Novērtējuma funkcija: atgriež (ai_score - human_score).
+    Jo lielāka vērtība, jo labāk Datoram.
+    """
+    return ai_score - human_score
+
+def generate_all_moves(state):
+    """
+    Ģenerē visus iespējamos nākamos stāvokļus (pēc viena gājiena).
+    state = (numbers, human_score, ai_score, current_player)
+    """
+    (numbers, human_score, ai_score, current_player) = state
+    
+    # Nosakām, kuru spēlētāju punkti tiks mainīti
+    if current_player == HUMAN:
+        current_score = human_score
+        opp_score = ai_score
+        next_player = AI
+    else:
+        current_score = ai_score
+        opp_score = human_score
+        next_player = HUMAN
+
+    next_states = []
+    numbers_list = list(numbers)
+
+    for i, val in enumerate(numbers_list):
+        # 1) Paņemt skaitli (to noņem no virknes un pieskaita saviem punktiem)
+        new_nums = list(numbers_list)
+        del new_nums[i]
+        new_score = current_score + val
+        if current_player == HUMAN:
+            new_state = (tuple(new_nums), new_score, opp_score, next_player)
+        else:
+            new_state = (tuple(new_nums), opp_score, new_score, next_player)
+        next_states.append(new_state)
+
+        # 2) Ja val == 2, var sadalīt 2 -> (1,1) un punkti nemainās
+        if val == 2:
+            new_nums2 = list(numbers_list)
+            new_nums2[i] = 1
+            new_nums2.insert(i+1, 1)
+            if current_player == HUMAN:
+                new_state2 = (tuple(new_nums2), current_score, opp_score, next_player)
+            else:
+                new_state2 = (tuple(new_nums2), opp_score, current_score, next_player)
+            next_states.append(new_state2)
+
+        # 3) Ja val == 4, var sadalīt 4 -> (2,2) un +1 punkts
+        if val == 4:
+            new_nums4 = list(numbers_list)
+            new_nums4[i] = 2
+            new_nums4.insert(i+1, 2)
+            new_score4 = current_score + 1  # +1 punkts par sadalīšanu
+            if current_player == HUMAN:
+                new_state4 = (tuple(new_nums4), new_score4, opp_score, next_player)
+            else:
+                new_state4 = (tuple(new_nums4), opp_score, new_score4, next_player)
+            next_states.append(new_state4)
+    
+    return next_states
+
+# -----------------------------
+# Skaitu vektora dzinējs
+# -----------------------------
+# Gājiena rezultāts nav atkarīgs no skaitļa vietas virknē, tāpēc stāvokli
+# var glabāt kā skaitu vektoru (c1, c2, c3, c4) - cik virknē ir 1, 2, 3 un 4.
+# Tad katrā virsotnē ir ne vairāk kā 6 dažādi gājieni, nevis līdz 3*N.
+
+# Visi iespējamie gājieni: (darbība, skaitlis)
+MOVES = (
+    ("take", 4),
+    ("take", 3),
+    ("take", 2),
+    ("take", 1),
+    ("split", 4),
+    ("split", 2),
+)
+
+# Punkti, ko dod katrs gājiens
+MOVE_POINTS = {move: (move[1] if move[0] == "take" else move[1] // 4) for move in MOVES}
+
+def to_counts(numbers):
+    """Pārvērš skaitļu virkni skaitu vektorā (c1, c2, c3, c4)."""
+    counts = [0, 0, 0, 0]
+    for val in numbers:
+        counts[val - 1] += 1
+    return tuple(counts)
+
+def apply_count_move(counts, move):
+    """
+    Izpilda gājienu uz skaitu vektora.
+    Atgriež (jaunais_vektors, iegūtie_punkti) vai None, ja gājiens nav iespējams.
+    """
+    action, val = move
+    if counts[val - 1] == 0:
+        return None
+    c = list(counts)
+    c[val - 1] -= 1
+    if action == "take":
+        return tuple(c), val
+    if val == 2:
+        c[0] += 2  # 2 -> (1,1), punkti nemainās
+        return tuple(c), 0
+    if val == 4:
+        c[1] += 2  # 4 -> (2,2), +1 punkts
+        return tuple(c), 1
+    return None
+
+def legal_count_moves(counts):
+    """Atgriež visus gājienus, kurus var izdarīt no šī skaitu vektora."""
+    return [move for move in MOVES if apply_count_move(counts, move) is not None]
+
+def max_moves_left(counts):
+    """
+    Lielākais iespējamais atlikušo gājienu skaits: 1 un 3 - viens gājiens,
+    2 - trīs gājieni (sadalīt un paņemt abus), 4 - septiņi gājieni.
+    Dziļāk par šo meklēt nav jēgas.
+    """
+    (c1, c2, c3, c4) = counts
+    return c1 + 3 * c2 + c3 + 7 * c4
+
+def generate_count_moves(state):
+    """
+    Tas pats, kas generate_all_moves, bet stāvoklim ar skaitu vektoru:
+    state = (counts, human_score, ai_score, current_player)
+    """
+    (counts, human_score, ai_score, current_player) = state
+    next_player = AI if current_player == HUMAN else HUMAN
+
+    next_states = []
+    for move in legal_count_moves(counts):
+        new_counts, points = apply_count_move(counts, move)
+        if current_player == HUMAN:
+            next_states.append((new_counts, human_score + points, ai_score, next_player))
+        else:
+            next_states.append((new_counts, human_score, ai_score + points, next_player))
+    return next_states
+
+def find_count_move(state, next_state):
+    """Noskaidro, kurš gājiens noved no state uz next_state (vai None)."""
+    for move, nxt in zip(legal_count_moves(state[0]), generate_count_moves(state)):
+        if nxt == next_state:
+            return move
+    return None
+
+def move_to_index(numbers, move):
+    """Atrod virknē konkrētu indeksu, uz kuru attiecas gājiens (pirmais atbilstošais skaitlis)."""
+    _, val = move
+    for i, x in enumerate(numbers):
+        if x == val:
+            return i
+    return None
+
+def describe_move(move):
+    """Gājiena apraksts latviski, piem. "paņem 4" vai "sadala 2"."""
+    action, val = move
+    return f"paņem {val}" if action == "take" else f"sadala {val}"
+
+def apply_action(numbers, action, index):
+    """
+    Izpilda darbību "take"/"split" uz virknes skaitli ar indeksu index.
+    Atgriež (jaunā_virkne, iegūtie_punkti) vai None, ja skaitli nevar sadalīt.
+    """
+    val = numbers[index]
+    nums = list(numbers)
+
+    if action == "take":
+        del nums[index]
+        return tuple(nums), val
+
+    if val == 2:
+        nums[index] = 1
+        nums.insert(index+1, 1)
+        return tuple(nums), 0
+    if val == 4:
+        nums[index] = 2
+        nums.insert(index+1, 2)
+        return tuple(nums), 1  # +1 punkts par sadalīšanu
+    return None
+
+# -----------------------------
+# Precīzais risinātājs
+# -----------------------------
+# Vērtība ir relatīva gājiena izdarītājam: par cik punktiem vairāk nekā pretinieks
+# viņš vēl iegūs līdz spēles beigām, ja abi spēlē perfekti. Jau iegūtie punkti
+# turpmāko spēli neietekmē, tāpēc pietiek ar skaitu vektoru.
+#
+# Vērtībai ir slēgta forma. Lai S ir skaitļi, kuru virknē ir nepāra skaits,
+# dilstošā secībā s1 > s2 > ...; tad vērtība ir G(S) = s1 - s2 + s3 - ...,
+# un labākais gājiens ir paņemt s1 (ja S ir tukša - paņemt jebkuru skaitli).
+# Pierādījums ar indukciju pēc atlikušo gājienu skaita: katrs gājiens maina
+# tieši viena skaitļa v skaita paritāti un dod q <= v punktu (paņemt v: q = v,
+# sadalīt 4: q = 1, sadalīt 2: q = 0). Paņemot s1, iegūst s1 - G(S bez s1) = G(S).
+# Ja v maiņa notiek zem k lielākiem S elementiem ar alternējošo summu A, tad
+# q - G(S △ {v}) <= G(S) izriet no q <= v un, ja k nepāra, A >= v + 1.
+# Rekursīvā meklēšana tāpēc nav vajadzīga; tablebase.py --verify to pārbauda
+# ar pilnu dinamisko programmēšanu.
+
+def closed_form(counts):
+    """Atgriež (vērtība, labākais_gājiens) skaitu vektoram counts O(1) laikā."""
+    value = 0
+    sign = 1
+    best_move = None
+    # Vienādu skaitļu pāri savstarpēji dzēšas, paliek tikai nepāra skaiti
+    for val in (4, 3, 2, 1):
+        if counts[val - 1] % 2:
+            if best_move is None:
+                best_move = ("take", val)
+            value += sign * val
+            sign = -sign
+    if best_move is None:
+        for val in (4, 3, 2, 1):
+            if counts[val - 1]:
+                best_move = ("take", val)
+                break
+    return value, best_move
+
+def closed_form_batch(counts):
+    """closed_form vērtības visām NumPy masīva (N, 4) rindām uzreiz."""
+    np = _numpy()
+    odd = counts.astype(np.int64) % 2
+    value = np.zeros(len(counts), dtype=np.int64)
+    sign = np.ones(len(counts), dtype=np.int64)
+    for val in (4, 3, 2, 1):
+        value += sign * val * odd[:, val - 1]
+        sign = np.where(odd[:, val - 1] == 1, -sign, sign)
+    return value
+
+def is_split_free(counts):
+    """Vai virknē vairs nav neviena 2 vai 4 (atlikušie gājieni ir tikai paņemšana)."""
+    return counts[1] == 0 and counts[3] == 0
+
+def solve_exact(counts):
+    """Atgriež (vērtība, labākais_gājiens) skaitu vektoram counts (skatīt closed_form)."""
+    if is_game_over(counts):
+        return 0, None
+    return closed_form(counts)
+
+# -----------------------------
+# Galotņu tabula (tablebase) diskā
+# -----------------------------
+# Faila formāts: galvene (maģija, versija, max_len) un tad fiksēta garuma ieraksti
+# (vērtība int16, gājiena numurs MOVES sarakstā uint8) katram skaitu vektoram
+# kastē c4 <= L, c3 <= L, c2 <= 2L, c1 <= 4L. Ieraksta vieta failā ir tieši
+# izrēķināma no vektora, tāpēc meklēšana nav vajadzīga.
+
+TB_MAGIC = b"SPTB"
+TB_VERSION = 1
+TB_HEADER = struct.Struct("<4sHH")
+TB_RECORD = struct.Struct("<hB")
+TB_NO_MOVE = 255  # spēle beigusies vai vektors nav tabulā
+
+def tablebase_dims(max_len):
+    """Kastes izmēri (c4, c3, c2, c1) tabulai ar virknes garumu līdz max_len."""
+    return (max_len + 1, max_len + 1, 2 * max_len + 1, 4 * max_len + 1)
+
+def tablebase_index(counts, max_len):
+    """Ieraksta numurs skaitu vektoram vai None, ja vektors ir ārpus kastes."""
+    (c1, c2, c3, c4) = counts
+    d4, d3, d2, d1 = tablebase_dims(max_len)
+    if c4 >= d4 or c3 >= d3 or c2 >= d2 or c1 >= d1:
+        return None
+    return ((c4 * d3 + c3) * d2 + c2) * d1 + c1
+
+def tablebase_covers(counts, max_len):
+    """
+    Vai vektors var rasties spēlē, kas sākās ar ne vairāk kā max_len skaitļiem.
+    Šie nosacījumi pēc jebkura gājiena paliek spēkā, tāpēc tabula ir slēgta.
+    """
+    (c1, c2, c3, c4) = counts
+    return (c3 + c4 <= max_len
+            and c2 + 2 * (c3 + c4) <= 2 * max_len
+            and c1 + 2 * c2 + 4 * (c3 + c4) <= 4 * max_len)
+
+def reduce_pairs(counts):
+    """
+    Izmet vienādu skaitļu pārus: paliek tikai skaitu paritāte. Vērtība un
+    labākais gājiens no tā nemainās (skatīt closed_form), tāpēc šādi jebkura
+    garuma virkni var atrisināt ar mazu tabulu.
+    """
+    return tuple(c % 2 for c in counts)
+
+class Tablebase:
+    """
+    Galotņu tabula, kas nolasīta tikai lasīšanai ar mmap.
+    Fails netiek ielādēts atmiņā - lapas kopīgi izmanto visi procesi.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_len = TB_HEADER.unpack_from(self.data, 0)
+        if magic != TB_MAGIC or version != TB_VERSION:
+            self.data.close()
+            raise ValueError(f"{path} nav derīgs galotņu tabulas fails")
+
+    def lookup(self, counts):
+        """
+        Atgriež (vērtība, labākais_gājiens) vai None, ja vektora tabulā nav.
+        Vektorus, kas neietilpst tabulā, vispirms samazina ar reduce_pairs.
+        """
+        if is_game_over(counts):
+            return 0, None
+        if not tablebase_covers(counts, self.max_len):
+            reduced = reduce_pairs(counts)
+            if is_game_over(reduced):
+                # Visi skaiti pāra: vērtība 0, der jebkura paņemšana
+                return 0, closed_form(counts)[1]
+            counts = reduced
+        index = tablebase_index(counts, self.max_len)
+        if index is None:
+            return None
+        value, move_code = TB_RECORD.unpack_from(self.data, TB_HEADER.size + index * TB_RECORD.size)
+        if move_code == TB_NO_MOVE:
+            return None
+        return value, MOVES[move_code]
+
+    def close(self):
+        self.data.close()
+
+def load_tablebase(path=TABLEBASE_PATH):
+    """Atver galotņu tabulu, ja fails eksistē, citādi atgriež None."""
+    if not os.path.exists(path):
+        return None
+    return Tablebase(path)
+
+def exact_pv(counts, tablebase=None):
+    """
+    Precīzais galvenais variants: labāko gājienu virkne līdz spēles beigām
+    (no galotņu tabulas, ja vektors tajā ir, citādi ar solve_exact).
+    """
+    pv = []
+    while not is_game_over(counts):
+        result = tablebase.lookup(counts) if tablebase else None
+        if result is None:
+            result = solve_exact(counts)
+        move = result[1]
+        pv.append(move)
+        counts, _ = apply_count_move(counts, move)
+    return tuple(pv)
+
+# -----------------------------
+# Heiristiskais novērtējums
+# -----------------------------
+# Meklēšanas robežā (dziļums 0) negamax atlikušās spēles vērtību pieņem par 0.
+# Evaluator to aizstāj ar lineāru novērtējumu no atlikušā skaitu vektora:
+# vērtība = svaru un pazīmju skalārais reizinājums (relatīvi gājiena izdarītājam).
+# Svarus pielāgo tune_eval.py pēc precīzā risinātāja vērtībām un glabā JSON failā.
+
+EVAL_FEATURES = (
+    "ones", "twos", "threes", "fours",                  # cik katra skaitļa palicis
+    "odd_ones", "odd_twos", "odd_threes", "odd_fours",  # vai to ir nepāra skaits
+    "moves_parity",  # max_moves_left(counts) % 2 - vai atlikušo gājienu skaits nepāra
+    # closed_form vērtība, kas ir precīzā spēles vērtība (skatīt solve_exact), tāpēc
+    # ar šo pazīmi mazāko kvadrātu pielāgojums ir triviāli precīzs (svars 1, pārējie 0)
+    "greedy",
+)
+
+def eval_features(counts):
+    """Pazīmju vektors skaitu vektoram counts (EVAL_FEATURES secībā)."""
+    c1, c2, c3, c4 = counts
+    return (c1, c2, c3, c4, c1 % 2, c2 % 2, c3 % 2, c4 % 2, max_moves_left(counts) % 2,
+            closed_form(counts)[0])
+
+class Evaluator:
+    """
+    Lineārs novērtējums: score(counts) = sum(svars * pazīme), noapaļots līdz
+    veselam skaitlim (PVS nulles logs pieņem veselas vērtības).
+    Svari, kuru nav, ir 0, tāpēc Evaluator() novērtē tāpat kā bez tā.
+    """
+    def __init__(self, weights=None):
+        self.weights = dict.fromkeys(EVAL_FEATURES, 0.0)
+        if weights:
+            for name, weight in weights.items():
+                if name not in self.weights:
+                    raise ValueError(f"Nezināma pazīme: {name}")
+                self.weights[name] = float(weight)
+        self._vector = tuple(self.weights[name] for name in EVAL_FEATURES)
+
+    def score(self, counts):
+        return round(sum(w * f for w, f in zip(self._vector, eval_features(counts))))
+
+    def score_batch(self, counts):
+        """Tas pats visām NumPy masīva (N, 4) rindām uzreiz (batched_search)."""
+        np = _numpy()
+        counts = counts.astype(np.int64)
+        moves_parity = (counts @ np.array((1, 3, 1, 7), dtype=np.int64)) % 2  # max_moves_left % 2
+        features = np.column_stack((counts, counts % 2, moves_parity, closed_form_batch(counts)))
+        # Saskaitām tādā pašā secībā kā score, lai noapaļošana sakristu arī pie x.5
+        total = np.zeros(len(counts))
+        for i, weight in enumerate(self._vector):
+            total = total + weight * features[:, i]
+        return np.rint(total).astype(np.int64)
+
+    def save(self, path=EVALUATOR_PATH):
+        import json
+        with open(path, "w") as f:
+            json.dump({"weights": self.weights}, f, indent=1)
+
+    @classmethod
+    def load(cls, path=EVALUATOR_PATH):
+        import json
+        with open(path) as f:
+            return cls(json.load(f)["weights"])
+
+def load_evaluator(path=EVALUATOR_PATH):
+    """Ielādē svarus, ja fails eksistē, citādi atgriež None (robežā vērtība 0)."""
+    if not os.path.exists(path):
+        return None
+    return Evaluator.load(path)
+
+# -----------------------------
+# Atklātņu grāmata
+# -----------------------------
+# Pirmais datora gājiens ir visdārgākā meklēšana spēlē, bet sākuma virknes ir
+# tikai 15..20 skaitļi no {1..4}, tāpēc iespējamo sākuma skaitu vektoru ir maz
+# (ap 7500). Grāmatā katram sākuma vektoram un katram vektoram pēc pirmā gājiena
+# ir iepriekš izrēķināts labākais gājiens. Atslēga ir skaitu vektors (kārtība
+# virknē gājienu neietekmē) un gājiena izdarītājs: 0 - tas, kurš sāka spēli,
+# 1 - otrais spēlētājs.
+
+# Cik pirmos gājienus (pustraucienus) grāmata aptver
+BOOK_PLIES = 2
+
+def book_key(counts, mover):
+    return "{},{},{},{}/{}".format(*counts, mover)
+
+class OpeningBook:
+    """Atklātņu grāmata: {book_key: (darbība, skaitlis)} ar trāpījumu skaitītājiem."""
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, counts, mover):
+        """Atgriež gājienu vai None. Katru pieprasījumu ieskaita trāpījumos vai garāmšāvienos."""
+        move = self.entries.get(book_key(counts, mover))
+        if move is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return move
+
+    def add(self, counts, mover, move):
+        self.entries[book_key(counts, mover)] = move
+
+    def save(self, path=OPENING_BOOK_PATH):
+        import json
+        with open(path, "w") as f:
+            json.dump({key: list(move) for key, move in self.entries.items()}, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path=OPENING_BOOK_PATH):
+        import json
+        with open(path) as f:
+            return cls({key: tuple(move) for key, move in json.load(f).items()})
+
+def load_opening_book(path=OPENING_BOOK_PATH):
+    """Atver atklātņu grāmatu, ja fails eksistē, citādi atgriež None."""
+    if not os.path.exists(path):
+        return None
+    return OpeningBook.load(path)
+
+# -----------------------------
+# Transpozīciju tabula
+# -----------------------------
+
+# Ieraksta robežas tips
+TT_EXACT = 0  # precīza vērtība
+TT_LOWER = 1  # apakšējā robeža (bija beta nogriešana)
+TT_UPPER = 2  # augšējā robeža (neviens gājiens nepārsniedza alpha)
+
+class TranspositionTable:
+    """
+    Jau izrēķināto pozīciju tabula, lai dažādas gājienu secības,
+    kas noved pie tās pašas pozīcijas, nebūtu jāmeklē vēlreiz.
+
+    Atslēga ir board.position_key(): Zobrist skaitlis (SearchBoard) vai pati
+    virkne (SequenceBoard), bez punktiem un gājiena izdarītāja, jo negamax
+    vērtības ir relatīvas gājiena izdarītājam.
+    Katrā slotā glabā (atslēga, dziļums, tips, vērtība, labākais_gājiens).
+    replacement="depth" -> slotu pārraksta tikai ar tikpat dziļu vai dziļāku meklēšanu,
+    replacement="always" -> slotu vienmēr pārraksta ar jaunāko ierakstu.
+    """
+    def __init__(self, size=1 << 16, replacement="depth"):
+        if replacement not in ("depth", "always"):
+            raise ValueError(f"Nezināma aizvietošanas politika: {replacement}")
+        self.size = size
+        self.replacement = replacement
+        self.slots = [None] * size
+
+    def probe(self, key):
+        """Atgriež ierakstu (dziļums, tips, vērtība, labākais_gājiens) vai None."""
+        entry = self.slots[hash(key) % self.size]
+        if entry is None or entry[0] != key:
+            return None
+        return entry[1:]
+
+    def store(self, key, depth, flag, value, best_move):
+        index = hash(key) % self.size
+        old = self.slots[index]
+        if self.replacement == "depth" and old is not None and old[0] != key and old[1] > depth:
+            return
+        self.slots[index] = (key, depth, flag, value, best_move)
+
+    def clear(self):
+        self.slots = [None] * self.size
+
+# -----------------------------
+# Zobrist atslēgas
+# -----------------------------
+# Pozīcijas atslēga ir 64 bitu skaitlis: XOR no nejaušām vērtībām katram
+# (skaitlis, cik reizes tas ir virknē). Gājiena izdarītājs atslēgā nav, jo
+# negamax vērtības ir relatīvas gājiena izdarītājam. Pēc gājiena atslēgu var
+# atjaunot O(1) laikā - jāmaina tikai 1-2 skaiti (SearchBoard.make/unmake).
+# To izmanto transpozīciju tabula (SearchBoard.position_key). Vērtības ir
+# deterministiskas (nav atkarīgas no procesa).
+
+_MASK64 = (1 << 64) - 1
+
+def _splitmix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+_zobrist_counts = [[], [], [], []]  # [skaitlis-1][skaits] -> vērtība
+
+def zobrist_count(val, count):
+    """Vērtība tam, ka skaitlis val virknē ir count reizes."""
+    table = _zobrist_counts[val - 1]
+    while len(table) <= count:
+        table.append(_splitmix64((val << 32) | len(table)))
+    return table[count]
+
+def zobrist_key(counts):
+    """Pilnībā izrēķina pozīcijas atslēgu."""
+    key = 0
+    for val in range(1, 5):
+        key ^= zobrist_count(val, counts[val - 1])
+    return key
+
+# -----------------------------
+# Meklēšanas dēlis (make/unmake)
+# -----------------------------
+# Tā vietā, lai katram bērnam veidotu jaunu stāvokļa kortežu, meklēšana
+# izmanto vienu maināmu dēli: gājienu izdara (make), izmeklē un atsauc (unmake).
+# Gājienus ģenerē pa vienam, tāpēc nogrieztiem zariem nekas netiek veidots.
+
+class SearchBoard:
+    """
+    Maināms skaitu vektora stāvoklis meklēšanai.
+    counts = [c1, c2, c3, c4], scores[HUMAN] un scores[AI] - punkti, player - kam jāiet,
+    hash - Zobrist atslēga (zobrist_key), ko make/unmake atjauno O(1) laikā.
+    """
+    def __init__(self, counts, human_score, ai_score, player):
+        self.counts = list(counts)
+        self.scores = [0, 0]
+        self.scores[HUMAN] = human_score
+        self.scores[AI] = ai_score
+        self.player = player
+        self.hash = zobrist_key(counts)
+        # Lai make/unmake varētu tabulas indeksēt tieši, tās jau tagad pagarinām
+        # līdz lielākajiem skaitiem, kas var rasties pēc sadalīšanām
+        (c1, c2, c3, c4) = counts
+        zobrist_count(1, c1 + 2 * c2 + 4 * c4)
+        zobrist_count(2, c2 + 2 * c4)
+        zobrist_count(3, c3)
+        zobrist_count(4, c4)
+
+    @classmethod
+    def from_state(cls, state):
+        (counts, human_score, ai_score, current_player) = state
+        return cls(counts, human_score, ai_score, current_player)
+
+    def is_game_over(self):
+        return not any(self.counts)
+
+    def count_vector(self):
+        return tuple(self.counts)
+
+    def moves(self):
+        """Atļautie gājieni pa vienam (MOVES secībā)."""
+        counts = self.counts
+        for move in MOVES:
+            if counts[move[1] - 1]:
+                yield move
+
+    def make(self, move):
+        action, val = move
+        counts = self.counts
+        c = counts[val - 1]
+        table = _zobrist_counts[val - 1]
+        h = self.hash ^ table[c] ^ table[c - 1]
+        counts[val - 1] = c - 1
+        if action == "split":
+            half = val // 2 - 1  # 4 -> (2,2), 2 -> (1,1)
+            c = counts[half]
+            table = _zobrist_counts[half]
+            h ^= table[c] ^ table[c + 2]
+            counts[half] = c + 2
+        self.hash = h
+        self.scores[self.player] += MOVE_POINTS[move]
+        self.player = 1 - self.player
+
+    def unmake(self, move):
+        action, val = move
+        self.player = 1 - self.player
+        self.scores[self.player] -= MOVE_POINTS[move]
+        counts = self.counts
+        h = self.hash
+        if action == "split":
+            half = val // 2 - 1
+            c = counts[half]
+            table = _zobrist_counts[half]
+            h ^= table[c] ^ table[c - 2]
+            counts[half] = c - 2
+        c = counts[val - 1]
+        table = _zobrist_counts[val - 1]
+        self.hash = h ^ table[c] ^ table[c + 1]
+        counts[val - 1] = c + 1
+
+    def position_key(self):
+        """
+        Atslēga tikai no atlikušās virknes (bez punktiem un gājiena izdarītāja).
+        Der negamax, kura vērtības ir relatīvas gājiena izdarītājam.
+        """
+        return self.hash
+
+    def points(self, move):
+        return MOVE_POINTS[move]
+
+    def split_free(self):
+        return is_split_free(self.counts)
+
+    def closed_form_line(self):
+        """Precīzais variants līdz beigām pozīcijai bez 2 un 4."""
+        return exact_pv(tuple(self.counts))
+
+    def move_id(self, move):
+        """Gājiena identitāte kārtošanas tabulām: (darbība, skaitlis)."""
+        return move
+
+    def state(self):
+        """Stāvoklis kortežā (counts, human_score, ai_score, current_player)."""
+        return (tuple(self.counts), self.scores[HUMAN], self.scores[AI], self.player)
+
+class SequenceBoard:
+    """
+    Tas pats dēlis skaitļu virknes stāvokļiem (kā generate_all_moves).
+    Gājiens ir (darbība, indekss, skaitlis), gājienu secība tāda pati kā
+    generate_all_moves. Atslēga ir pati virkne.
+    """
+    def __init__(self, numbers, human_score, ai_score, player):
+        self.numbers = list(numbers)
+        self.scores = [0, 0]
+        self.scores[HUMAN] = human_score
+        self.scores[AI] = ai_score
+        self.player = player
+
+    @classmethod
+    def from_state(cls, state):
+        (numbers, human_score, ai_score, current_player) = state
+        return cls(numbers, human_score, ai_score, current_player)
+
+    def is_game_over(self):
+        return not self.numbers
+
+    def count_vector(self):
+        return to_counts(self.numbers)
+
+    def moves(self):
+        # make/unmake starp iterācijām virkni atjauno, tāpēc to drīkst iterēt tieši
+        for i, val in enumerate(self.numbers):
+            yield ("take", i, val)
+            if val == 2 or val == 4:
+                yield ("split", i, val)
+
+    def make(self, move):
+        action, i, val = move
+        if action == "take":
+            del self.numbers[i]
+        else:
+            half = val // 2
+            self.numbers[i] = half
+            self.numbers.insert(i + 1, half)
+        self.scores[self.player] += MOVE_POINTS[(action, val)]
+        self.player = 1 - self.player
+
+    def unmake(self, move):
+        action, i, val = move
+        self.player = 1 - self.player
+        self.scores[self.player] -= MOVE_POINTS[(action, val)]
+        if action == "take":
+            self.numbers.insert(i, val)
+        else:
+            del self.numbers[i + 1]
+            self.numbers[i] = val
+
+    def position_key(self):
+        return tuple(self.numbers)
+
+    def points(self, move):
+        return MOVE_POINTS[(move[0], move[2])]
+
+    def split_free(self):
+        return 2 not in self.numbers and 4 not in self.numbers
+
+    def closed_form_line(self):
+        """Precīzais variants līdz beigām: katru reizi paņem pirmo vajadzīgā skaitļa vietu."""
+        numbers = list(self.numbers)
+        line = []
+        for _, val in exact_pv(to_counts(numbers)):
+            i = numbers.index(val)
+            line.append(("take", i, val))
+            del numbers[i]
+        return tuple(line)
+
+    def move_id(self, move):
+        return (move[0], move[2])
+
+    def state(self):
+        return (tuple(self.numbers), self.scores[HUMAN], self.scores[AI], self.player)
+
+
+# -----------------------------
+# Gājienu kārtošana
+# -----------------------------
+# Alfa-beta nogriež vairāk zaru, ja labākie gājieni tiek pārbaudīti pirmie.
+
+# Statiskā prioritāte: vispirms lielie skaitļi, sadalīt 4 pirms sadalīt 2
+MOVE_PRIORITY = {
+    ("take", 4): 5,
+    ("take", 3): 4,
+    ("take", 2): 3,
+    ("split", 4): 2,
+    ("take", 1): 1,
+    ("split", 2): 0,
+}
+
+class SearchStats:
+    """
+    Meklēšanas skaitītāji: apmeklētās virsotnes (no tām qnodes - klusuma meklēšanā),
+    alfa-beta nogriešanas, transpozīciju tabulas trāpījumi, izvērstās virsotnes un
+    to bērni, sasniegtais dziļums un meklēšanas laiks (s). Dziļumu un laiku aizpilda Engine.
+    """
+    def __init__(self):
+        self.nodes = 0
+        self.qnodes = 0
+        self.cutoffs = 0
+        self.tt_hits = 0
+        self.expanded = 0
+        self.children = 0
+        self.max_depth = 0
+        self.time = 0.0
+
+    @property
+    def branching_factor(self):
+        """Vidējais pārbaudīto bērnu skaits vienai izvērstajai virsotnei."""
+        return self.children / self.expanded if self.expanded else 0.0
+
+    def merge(self, other):
+        """Pieskaita cita meklētāja (piem., darba procesa) skaitītājus."""
+        self.nodes += other.nodes
+        self.qnodes += other.qnodes
+        self.cutoffs += other.cutoffs
+        self.tt_hits += other.tt_hits
+        self.expanded += other.expanded
+        self.children += other.children
+
+    def as_dict(self):
+        return {"nodes": self.nodes, "qnodes": self.qnodes, "cutoffs": self.cutoffs, "tt_hits": self.tt_hits,
+                "max_depth": self.max_depth, "branching_factor": round(self.branching_factor, 3),
+                "time": round(self.time, 6)}
+
+class MoveOrdering:
+    """
+    Kārto gājienus pirms alfa-beta meklēšanas:
+    1) killer gājieni - gājieni, kas šajā dziļumā jau izraisīja nogriešanu,
+    2) vēstures tabula - cik bieži (un cik dziļi) gājiens izraisīja nogriešanu,
+    3) statiskā prioritāte MOVE_PRIORITY.
+    Tabulas gājienu (hash move) negamax joprojām liek pašu pirmo.
+    Gājienus salīdzina pēc board.move_id(move), tāpēc der abiem dēļu veidiem.
+    """
+    def __init__(self, use_killers=True, use_history=True):
+        self.use_killers = use_killers
+        self.use_history = use_history
+        self.killers = {}  # dziļums -> [pēdējie 2 killer gājieni]
+        self.history = {}  # gājiens -> punkti
+
+    def order(self, board, moves, depth):
+        killers = self.killers.get(depth, ()) if self.use_killers else ()
+
+        def score(move):
+            move = board.move_id(move)
+            return (move in killers,
+                    self.history.get(move, 0) if self.use_history else 0,
+                    MOVE_PRIORITY[move])
+
+        return sorted(moves, key=score, reverse=True)
+
+    def record_cutoff(self, board, move, depth):
+        move = board.move_id(move)
+        if self.use_killers:
+            killers = self.killers.setdefault(depth, [])
+            if move not in killers:
+                killers.insert(0, move)
+                del killers[2:]
+        if self.use_history:
+            self.history[move] = self.history.get(move, 0) + depth * depth
+
+    def clear(self):
+        self.killers = {}
+        self.history = {}
+
+def _hash_move_first(moves, best_move):
+    """Ja tabulā ir labākais gājiens no iepriekšējās meklēšanas, to pārbaudām pirmo."""
+    if best_move is not None and best_move in moves:
+        moves.remove(best_move)
+        moves.insert(0, best_move)
+    return moves
+
+# -----------------------------
+# Negamax meklēšana
+# -----------------------------
+# Viens meklēšanas kodols visiem algoritmiem. Vērtība vienmēr ir relatīva
+# gājiena izdarītājam (par cik punktiem vairāk nekā pretinieks viņš vēl iegūs),
+# tāpēc maksimizētāja un minimizētāja zari nav jāatkārto: bērna vērtību
+# vienkārši atņem no gājiena punktiem. minimax un alpha_beta ir ietinumi,
+# kas vērtību pārvērš atpakaļ par ai_score - human_score.
+
+class SearchTimeout(Exception):
+    """Meklēšanai atvēlētais laiks ir beidzies (vai meklēšana atcelta)."""
+
+# Klusuma meklēšana (quiescence): robežā sadalīšana vēl maina, kuram tiks lielie
+# skaitļi, tāpēc robežas vērtība ir neprecīza. Robežā turpina meklēt tikai
+# sadalīšanas gājienus; gājiena izdarītājs var arī "stāvēt" ar robežas vērtību.
+# Katrai robežas virsotnei drīkst izmantot ne vairāk kā quiescence_nodes virsotņu.
+QUIESCENCE_NODES = 64
+
+def _quiescence(board, alpha, beta, budget, stats, evaluator):
+    """
+    Meklē tikai sadalīšanas gājienus. budget - [atlikušais virsotņu skaits],
+    kopīgs visam apakškokam. Atgriež (vērtība, galvenais_variants) kā negamax.
+    """
+    if board.is_game_over():
+        return 0, ()
+    if board.split_free():
+        return closed_form(board.count_vector())[0], board.closed_form_line()
+    stand_pat = evaluator.score(board.count_vector()) if evaluator is not None else 0
+    if stand_pat >= beta:
+        return stand_pat, ()
+    alpha = max(alpha, stand_pat)
+    best_value = stand_pat
+    best_pv = ()
+    for move in board.moves():
+        if move[0] != "split":
+            continue
+        if budget[0] <= 0:
+            break
+        budget[0] -= 1
+        if stats is not None:
+            stats.nodes += 1
+            stats.qnodes += 1
+        points = board.points(move)
+        board.make(move)
+        val, child_pv = _quiescence(board, points - beta, points - alpha, budget, stats, evaluator)
+        board.unmake(move)
+        value = points - val
+        if value > best_value:
+            best_value = value
+            best_pv = (move,) + child_pv
+        alpha = max(alpha, best_value)
+        if alpha >= beta:
+            break
+    return best_value, best_pv
+
+def negamax(board, depth, alpha=-999999, beta=999999, tt=None, ordering=None, stats=None,
+            deadline=None, cancel=None, first_move=None, pruning=True, pvs=False, evaluator=None,
+            quiescence_nodes=0):
+    """
+    Meklē no board (SearchBoard vai SequenceBoard) līdz dziļumam depth.
+    Atgriež (vērtība, galvenais_variants): vērtība ir relatīva gājiena izdarītājam,
+    galvenais variants ir sagaidāmo gājienu kortežs, sākot ar labāko.
+    Meklēšanas robežās (dziļums 0) atlikušo punktu starpību pieņem par 0.
+    Pozīcijas bez 2 un 4 netiek meklētas: to precīzo vērtību un variantu dod closed_form.
+
+    pruning=False -> pilns minimax (bez nogriešanas),
+    pvs=True -> pēc pirmā gājiena pārējos pārbauda ar nulles logu un pilno logu
+                izmanto tikai tad, ja gājiens izrādās labāks (PVS/NegaScout).
+    tt - transpozīciju tabula ar atslēgu board.position_key(), der jebkurai
+         punktu vēsturei; ordering - MoveOrdering; stats - SearchStats.
+    deadline/cancel - pēc time.perf_counter() laika vai uzstādīta threading.Event
+         meklēšanu pārtrauc ar SearchTimeout (dēlis tad var palikt pusmainīts).
+    first_move - gājiens, kuru pārbaudīt pirmo (piem., no iepriekšējās iterācijas).
+    evaluator (Evaluator) - ja padots, robežā vērtību novērtē ar to, nevis pieņem 0.
+    quiescence_nodes - ja > 0, robežā turpina ar klusuma meklēšanu (tikai sadalīšana)
+         un tajā katrai robežas virsotnei izmanto ne vairāk kā tik virsotņu.
+    """
+    if stats is not None:
+        stats.nodes += 1
+
+    if board.is_game_over():
+        return 0, ()
+    if board.split_free():
+        return closed_form(board.count_vector())[0], board.closed_form_line()
+    if depth == 0:
+        if quiescence_nodes > 0:
+            return _quiescence(board, alpha, beta, [quiescence_nodes], stats, evaluator)
+        return (evaluator.score(board.count_vector()) if evaluator is not None else 0), ()
+
+    if deadline is not None and time.perf_counter() > deadline:
+        raise SearchTimeout()
+    if cancel is not None and cancel.is_set():
+        raise SearchTimeout()
+
+    if not pruning:
+        alpha, beta, pvs = -999999, 999999, False
+    alpha_orig = alpha
+    hash_move = None
+    key = None
+    if tt is not None:
+        key = board.position_key()
+        entry = tt.probe(key)
+        if entry is not None:
+            if stats is not None:
+                stats.tt_hits += 1
+            entry_depth, flag, value, hash_move = entry
+            if entry_depth >= depth:
+                pv = (hash_move,) if hash_move is not None else ()
+                if flag == TT_EXACT:
+                    return value, pv
+                elif flag == TT_LOWER:
+                    alpha = max(alpha, value)
+                elif flag == TT_UPPER:
+                    beta = min(beta, value)
+                if beta <= alpha:
+                    return value, pv
+
+    moves = board.moves()
+    if ordering is not None or hash_move is not None or first_move is not None:
+        moves = list(moves)
+        if ordering is not None:
+            moves = ordering.order(board, moves, depth)
+        moves = _hash_move_first(moves, hash_move)
+        moves = _hash_move_first(moves, first_move)
+
+    if stats is not None:
+        stats.expanded += 1
+    best_value = -999999
+    best_pv = ()
+    cutoff = False
+    for move in moves:
+        if stats is not None:
+            stats.children += 1
+        points = board.points(move)
+        board.make(move)
+        # value = points - bērna_vērtība, tāpēc logs (alpha, beta) bērnam ir
+        # (points - beta, points - alpha)
+        if pvs and best_pv:
+            val, child_pv = negamax(board, depth - 1, points - alpha - 1, points - alpha, tt, ordering,
+                                    stats, deadline, cancel, None, pruning, pvs, evaluator,
+                                    quiescence_nodes)
+            if alpha < points - val < beta:
+                val, child_pv = negamax(board, depth - 1, points - beta, points - alpha, tt, ordering,
+                                        stats, deadline, cancel, None, pruning, pvs, evaluator,
+                                        quiescence_nodes)
+        else:
+            val, child_pv = negamax(board, depth - 1, points - beta, points - alpha, tt, ordering,
+                                    stats, deadline, cancel, None, pruning, pvs, evaluator,
+                                    quiescence_nodes)
+        board.unmake(move)
+        value = points - val
+        if value > best_value:
+            best_value = value
+            best_pv = (move,) + child_pv
+        if pruning:
+            alpha = max(alpha, best_value)
+            if alpha >= beta:
+                cutoff = True
+                break
+
+    if cutoff:
+        if stats is not None:
+            stats.cutoffs += 1
+        if ordering is not None:
+            ordering.record_cutoff(board, best_pv[0], depth)
+
+    if tt is not None:
+        if best_value <= alpha_orig:
+            flag = TT_UPPER
+        elif best_value >= beta:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        tt.store(key, depth, flag, best_value, best_pv[0])
+    return best_value, best_pv
+
+def _board_from_state(state, move_gen):
+    """generate_all_moves -> SequenceBoard (virkne), citādi SearchBoard (skaitu vektors)."""
+    if move_gen is generate_all_moves:
+        return SequenceBoard.from_state(state)
+    return SearchBoard.from_state(state)
+
+def _child_state(board, move):
+    board.make(move)
+    child = board.state()
+    board.unmake(move)
+    return child
+
+def _search_result(state, board, maximizing_player, value, pv):
+    """Negamax rezultātu pārvērš par (ai_score - human_score, labākais_stāvoklis)."""
+    diff = evaluate(state[1], state[2])
+    value = diff + value if maximizing_player else diff - value
+    best_state = _child_state(board, pv[0]) if pv else state
+    return value, best_state
+
+def minimax(state, depth, maximizing_player, tt=None, move_gen=generate_all_moves, stats=None,
+            evaluator=None):
+    """
+    Minimax algoritms (bez alpha-beta).
+    Atgriež (labākā_vērtība, labākais_stāvoklis), vērtība ir ai_score - human_score.
+    maximizing_player jābūt True, ja jāiet datoram (state[3] == AI).
+    Ja padota transpozīciju tabula tt, jau izrēķinātos stāvokļus neizrēķina atkārtoti.
+    move_gen nosaka stāvokļa veidu: generate_all_moves (virkne) vai generate_count_moves.
+    stats (SearchStats) - ja padots, tajā skaita apmeklētās virsotnes.
+    evaluator (Evaluator) - robežas novērtējums (None -> tikai punktu starpība).
+    """
+    board = _board_from_state(state, move_gen)
+    value, pv = negamax(board, depth, tt=tt, stats=stats, pruning=False, evaluator=evaluator)
+    return _search_result(state, board, maximizing_player, value, pv)
+
+def alpha_beta(state, depth, alpha, beta, maximizing_player, tt=None, move_gen=generate_all_moves,
+               deadline=None, first_state=None, ordering=None, stats=None, cancel=None, pvs=False,
+               evaluator=None, quiescence_nodes=0):
+    """
+    Minimax ar alfa-beta griešanu.
+    Atgriež (labākā_vērtība, labākais_stāvoklis), vērtība ir ai_score - human_score.
+    Ja padota transpozīciju tabula tt, izmanto tajā saglabātās robežas
+    un labāko gājienu pārbauda pirmo.
+    deadline - time.perf_counter() laiks, pēc kura meklēšanu pārtrauc ar SearchTimeout.
+    first_state - bērns, kuru pārbaudīt pirmo (piem., labākais no iepriekšējās iterācijas).
+    ordering (MoveOrdering) - ja padots, bērnus kārto pēc heiristikām.
+    stats (SearchStats) - ja padots, tajā skaita virsotnes un nogriešanas.
+    cancel (threading.Event) - ja tas ir uzstādīts, meklēšanu pārtrauc ar SearchTimeout.
+    pvs - izmantot PVS nulles loga meklēšanu.
+    evaluator (Evaluator) - robežas novērtējums (None -> tikai punktu starpība).
+    quiescence_nodes - klusuma meklēšanas virsotņu limits robežā (0 -> bez tās).
+    """
+    board = _board_from_state(state, move_gen)
+    diff = evaluate(state[1], state[2])
+    if maximizing_player:
+        lo, hi = alpha - diff, beta - diff
+    else:
+        lo, hi = diff - beta, diff - alpha
+
+    first_move = None
+    if first_state is not None:
+        for move in board.moves():
+            if _child_state(board, move) == first_state:
+                first_move = move
+                break
+
+    value, pv = negamax(board, depth, lo, hi, tt, ordering, stats, deadline, cancel, first_move,
+                        True, pvs, evaluator, quiescence_nodes)
+    return _search_result(state, board, maximizing_player, value, pv)
+
+# Aspirācijas loga pusplatums (punktos) iteratīvajā padziļināšanā
+ASPIRATION_WINDOW = 2
+
+def iterative_deepening(state, time_budget_ms, max_depth, tt=None, ordering=None, stats=None,
+                        cancel=None, pvs=True, aspiration=True, evaluator=None, quiescence_nodes=0):
+    """
+    Atkārtoti palaiž negamax ar dziļumu 1, 2, 3, ... kamēr nav iztērēts
+    time_budget_ms milisekunžu. state ir skaitu vektora stāvoklis.
+    Atgriež (vērtība, galvenais_variants, dziļums) no dziļākās pilnībā pabeigtās
+    iterācijas; vērtība ir relatīva gājiena izdarītājam. Iepriekšējās iterācijas
+    labāko gājienu nākamajā pārbauda pirmo. Ar aspiration nākamo iterāciju sāk ar
+    šauru logu ap iepriekšējo vērtību un pilno logu izmanto tikai, ja vērtība
+    izkrīt ārpus tā. Dziļums 1 tiek pabeigts vienmēr (ja vien meklēšana nav atcelta).
+    evaluator (Evaluator) - robežas novērtējums (None -> 0).
+    quiescence_nodes - klusuma meklēšanas virsotņu limits robežā (0 -> bez tās).
+    """
+    deadline = time.perf_counter() + time_budget_ms / 1000
+    best_value, best_pv, best_depth = None, (), 0
+
+    for depth in range(1, max_depth + 1):
+        first_move = best_pv[0] if best_pv else None
+        limit = deadline if depth > 1 else None
+        try:
+            # Pēc SearchTimeout dēlis var palikt pusmainīts, tāpēc katrai meklēšanai savs
+            if aspiration and best_value is not None:
+                lo, hi = best_value - ASPIRATION_WINDOW, best_value + ASPIRATION_WINDOW
+                value, pv = negamax(SearchBoard.from_state(state), depth, lo, hi, tt, ordering, stats,
+                                    limit, cancel, first_move, True, pvs, evaluator, quiescence_nodes)
+                if value <= lo or value >= hi:
+                    value, pv = negamax(SearchBoard.from_state(state), depth, -999999, 999999, tt,
+                                        ordering, stats, limit, cancel, first_move, True, pvs, evaluator,
+                                        quiescence_nodes)
+            else:
+                value, pv = negamax(SearchBoard.from_state(state), depth, -999999, 999999, tt,
+                                    ordering, stats, limit, cancel, first_move, True, pvs, evaluator,
+                                    quiescence_nodes)
+        except SearchTimeout:
+            break
+        best_value, best_pv, best_depth = value, pv, depth
+        if time.perf_counter() > deadline:
+            break
+
+    return best_value, best_pv, best_depth
+
+# -----------------------------
+# Meklēšana pa līmeņiem ar NumPy
+# -----------------------------
+# Tā pati pilna platuma meklēšana kā minimax, bet bez rekursijas: visu līmeņa
+# virsotņu skaitu vektori ir vienā NumPy masīvā, un nākamo līmeni izrēķina
+# uzreiz visiem 6 gājieniem. Vienādos vektorus vienā līmenī apvieno (np.unique),
+# jo relatīvā vērtība ir atkarīga tikai no vektora un atlikušā dziļuma.
+# Vērtības atpakaļ uz sakni izplata ar masīvu max/argmax pa gājienu asi.
+
+def _batch_move_tables():
+    """(skaitu izmaiņas (6, 4), kurš skaitlis vajadzīgs (6,), punkti (6,)) MOVES secībā."""
+    np = _numpy()
+    deltas = []
+    for action, val in MOVES:
+        delta = [0, 0, 0, 0]
+        delta[val - 1] = -1
+        if action == "split":
+            delta[val // 2 - 1] += 2
+        deltas.append(delta)
+    need = [val - 1 for _, val in MOVES]
+    points = [MOVE_POINTS[move] for move in MOVES]
+    return np.array(deltas, dtype=np.int32), np.array(need), np.array(points, dtype=np.int64)
+
+def batched_search(counts, depth, stats=None, evaluator=None):
+    """
+    Pilna platuma meklēšana līdz dziļumam depth no skaitu vektora counts.
+    Atgriež (vērtība, galvenais_variants) tāpat kā negamax bez nogriešanas:
+    vērtība ir relatīva gājiena izdarītājam, robežās atlikušo starpību pieņem par 0.
+    stats (SearchStats) - nodes ir apvienoto (unikālo) virsotņu skaits visos līmeņos.
+    evaluator (Evaluator) - robežas virsotnes novērtē ar score_batch visas uzreiz.
+    """
+    np = _numpy()
+    if np is None:
+        raise RuntimeError("batched_search vajag NumPy")
+    deltas, need, points = _batch_move_tables()
+
+    # Uz leju: katram līmenim (skaitu vektori, atļautie gājieni (N, 6), bērna numurs
+    # nākamajā līmenī (N, 6)). Virsotnes bez 2 un 4 netiek izvērstas - tām vērtība
+    # ir closed_form_batch.
+    level = np.array([counts], dtype=np.int32)
+    levels = []
+    for _ in range(depth):
+        if stats is not None:
+            stats.nodes += len(level)
+        split_free = (level[:, 1] == 0) & (level[:, 3] == 0)
+        legal = (level[:, need] > 0) & ~split_free[:, None]
+        if not legal.any():
+            break
+        if stats is not None:
+            stats.expanded += int(legal.any(axis=1).sum())
+            stats.children += int(legal.sum())
+        children = (level[:, None, :] + deltas[None, :, :])[legal]
+        next_level, inverse = np.unique(children, axis=0, return_inverse=True)
+        child_index = np.zeros(legal.shape, dtype=np.int64)
+        child_index[legal] = inverse.reshape(-1)
+        levels.append((level, legal, child_index))
+        level = next_level
+    else:
+        if stats is not None:
+            stats.nodes += len(level)
+
+    # Uz augšu: robežas virsotnēm vērtība 0 (vai novērtējums), virsotnēm bez 2 un 4 -
+    # slēgtā forma, pārējām max(punkti - bērna_vērtība)
+    split_free = (level[:, 1] == 0) & (level[:, 3] == 0)
+    if evaluator is not None and len(levels) == depth:
+        values = np.where(level.any(axis=1), evaluator.score_batch(level), 0)
+    else:
+        values = np.zeros(len(level), dtype=np.int64)
+    values = np.where(split_free, closed_form_batch(level), values)
+    best_moves = []
+    for counts_level, legal, child_index in reversed(levels):
+        scores = np.where(legal, points[None, :] - values[child_index], -999999)
+        best = scores.argmax(axis=1)
+        values = np.where(legal.any(axis=1), scores[np.arange(len(best)), best],
+                          closed_form_batch(counts_level))
+        best_moves.append(best)
+    best_moves.reverse()
+
+    pv = []
+    node = 0
+    leaf_level = level
+    for (counts_level, legal, child_index), best in zip(levels, best_moves):
+        if not legal[node].any():
+            leaf_level = counts_level
+            break
+        move = best[node]
+        pv.append(MOVES[move])
+        node = child_index[node, move]
+    leaf = tuple(int(c) for c in leaf_level[node])
+    if is_split_free(leaf):
+        pv.extend(exact_pv(leaf))
+    return int(values[0]), tuple(pv)
+
+def _ragged_range(lengths):
+    """(grupas numurs, skaitlis) visiem range(n) pēc kārtas katram n no lengths."""
+    np = _numpy()
+    group = np.repeat(np.arange(len(lengths)), lengths)
+    starts = np.cumsum(lengths) - lengths
+    return group, np.arange(len(group)) - starts[group]
+
+def layered_tablebase(max_len):
+    """
+    Tas pats, ko tablebase.py build_tablebase (vērtības un gājienu kodi visai
+    kastei), bet ar NumPy pa slāņiem. Slānis ir visi vektori ar vienādu
+    max_moves_left: katrs gājiens to samazina (par 1, 3 vai 7), tāpēc visu
+    bērnu vērtības ir iepriekšējos slāņos, un visu slāni izrēķina ar masīvu
+    operācijām. (Punktu summa c1 + 2*c2 + 3*c3 + 4*c4 slāņiem neder - sadalīšana
+    to nemaina.) Atmiņa ir tikai pašas tabulas masīvi.
+    Atgriež (vērtības int16, gājienu_kodi uint8) masīvus.
+    """
+    np = _numpy()
+    if np is None:
+        raise RuntimeError("layered_tablebase vajag NumPy")
+    d4, d3, d2, d1 = tablebase_dims(max_len)
+    size = d4 * d3 * d2 * d1
+    values = np.zeros(size, dtype=np.int16)
+    moves = np.full(size, TB_NO_MOVE, dtype=np.uint8)
+
+    # Tikai vektori, kas var rasties spēlē (tablebase_covers): katram (c4, c3) visi
+    # atļautie c2 un katram (c4, c3, c2) visi atļautie c1 (skatīt _ragged_range)
+    c4, c3 = np.divmod(np.arange(d4 * d3), d3)
+    keep = c3 + c4 <= max_len
+    c4, c3 = c4[keep], c3[keep]
+    group, c2 = _ragged_range(2 * max_len - 2 * (c3 + c4) + 1)
+    c4, c3 = c4[group], c3[group]
+    group, c1 = _ragged_range(4 * max_len - 2 * c2 - 4 * (c3 + c4) + 1)
+    counts = np.stack((c1, c2[group], c3[group], c4[group]))[:, 1:]  # bez tukšā vektora
+    index = ((counts[3] * d3 + counts[2]) * d2 + counts[1]) * d1 + counts[0]
+    layer = counts[0] + 3 * counts[1] + counts[2] + 7 * counts[3]
+    order = np.argsort(layer, kind="stable")
+    index, counts, layer = index[order], counts[:, order], layer[order]
+    bounds = np.flatnonzero(np.diff(layer)) + 1
+
+    stride = (1, d1, d1 * d2, d1 * d2 * d3)
+    deltas = []
+    for action, val in MOVES:
+        if action == "take":
+            deltas.append((val, -stride[val - 1]))
+        elif val == 2:
+            deltas.append((val, -stride[1] + 2 * stride[0]))
+        else:
+            deltas.append((val, -stride[3] + 2 * stride[1]))
+    points = np.array([MOVE_POINTS[move] for move in MOVES], dtype=np.int32)
+
+    for start, stop in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(index)]))):
+        layer_index = index[start:stop]
+        scores = np.full((len(MOVES), stop - start), -999999, dtype=np.int32)
+        for code, (val, delta) in enumerate(deltas):
+            legal = counts[val - 1, start:stop] > 0
+            child = layer_index[legal] + delta
+            scores[code, legal] = points[code] - values[child]
+        # argmax dod pirmo labāko gājienu MOVES secībā, tāpat kā build_tablebase
+        best = scores.argmax(axis=0)
+        values[layer_index] = scores[best, np.arange(stop - start)]
+        moves[layer_index] = best
+    return values, moves
+
+# -----------------------------
+# Paralēlā meklēšana
+# -----------------------------
+# Saknes gājienus sadala pa procesiem. Pirmo (pēc kārtošanas labāko) gājienu
+# meklē pats galvenais process (Young Brothers Wait), lai iegūtu labu alpha
+# robežu, un tikai tad pārējos brāļus palaiž paralēli. Kopīgo alpha visi
+# procesi lasa no multiprocessing.Value, un katrs to paaugstina, kad atrod labāku.
+
+_worker_alpha = None
+_worker_generation = None
+_worker_tt = None
+
+def _init_search_worker(shared_alpha, generation):
+    global _worker_alpha, _worker_generation, _worker_tt
+    _worker_alpha = shared_alpha
+    _worker_generation = generation
+    _worker_tt = TranspositionTable(size=1 << 18)
+
+class _StaleSearch:
+    """cancel objekts darba procesam: uzstādīts, kad galvenais process sācis citu meklēšanu."""
+    def __init__(self, generation):
+        self.generation = generation
+
+    def is_set(self):
+        return _worker_generation.value != self.generation
+
+def _search_root_child(child, depth, move_gen, generation):
+    """
+    Meklē vienu saknes bērnu darba procesā. Atgriež (vērtība, izmantotais_alpha,
+    SearchStats) vai None, ja meklēšana, kurai bērns piederēja, jau beigusies vai
+    atcelta. Kopīgo alpha paaugstina tikai tās pašas meklēšanas (generation) ietvaros.
+    """
+    alpha = _worker_alpha.value
+    stats = SearchStats()
+    try:
+        value, _ = alpha_beta(child, depth - 1, alpha, 999999, False, _worker_tt, move_gen,
+                              stats=stats, cancel=_StaleSearch(generation))
+    except SearchTimeout:
+        return None
+    with _worker_alpha.get_lock():
+        if _worker_generation.value != generation:
+            return None
+        if value > _worker_alpha.value:
+            _worker_alpha.value = value
+    return value, alpha, stats
+
+class ParallelSearch:
+    """
+    Alfa-beta meklēšana, kas saknes gājienus sadala pa workers procesiem.
+    Meklē no datora (maksimizētāja) viedokļa. Procesi tiek izveidoti vienreiz
+    un izmantoti visos gājienos, katram ir sava transpozīciju tabula.
+    Katrai meklēšanai ir savs numurs (generation): kad meklēšana beidzas vai
+    tiek atcelta, numurs mainās, un vēl strādājošie uzdevumi apstājas un
+    kopīgo alpha vairs neaiztiek.
+    """
+    # Cik bieži (s) galvenais process, gaidot darba procesus, pārbauda cancel un deadline
+    POLL_INTERVAL = 0.02
+
+    def __init__(self, workers=None):
+        # multiprocessing imports ir lēns, un tas vajadzīgs tikai šim režīmam
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.workers = workers or os.cpu_count() or 1
+        # Spēlē pūls tiek izveidots AI pavedienā, kamēr galvenajā strādā pygame/SDL;
+        # fork no daudzpavedienu procesa var iestrēgt, tāpēc procesus startē ar spawn
+        context = multiprocessing.get_context("spawn")
+        self.shared_alpha = context.Value("i", -999999)
+        # Numuru maina tikai ar shared_alpha slēdzeni, tāpēc savējā nav vajadzīga
+        self.generation = context.Value("i", 0, lock=False)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                        initializer=_init_search_worker,
+                                        initargs=(self.shared_alpha, self.generation))
+        self.tt = TranspositionTable(size=1 << 18)
+
+    def _next_generation(self, alpha):
+        """Sāk jaunu meklēšanu: jauns numurs un kopīgais alpha, abi vienlaikus."""
+        with self.shared_alpha.get_lock():
+            self.generation.value += 1
+            self.shared_alpha.value = alpha
+            return self.generation.value
+
+    def search(self, state, depth, move_gen=generate_count_moves, cancel=None, deadline=None, stats=None):
+        """
+        Atgriež (labākā_vērtība, labākais_stāvoklis), tāpat kā alpha_beta.
+        cancel (threading.Event) vai deadline (time.perf_counter() laiks) pārtrauc
+        meklēšanu ar SearchTimeout; darba procesu uzdevumi tad apstājas paši.
+        stats (SearchStats) - galvenā procesa un visu darba procesu skaitītāju summa.
+        """
+        (numbers, human_score, ai_score, current_player) = state
+        if is_game_over(numbers) or depth == 0:
+            return evaluate(human_score, ai_score), state
+
+        children = move_gen(state)
+        if stats is not None:
+            stats.nodes += 1
+            stats.expanded += 1
+            stats.children += len(children)
+        best_value, _ = alpha_beta(children[0], depth - 1, -999999, 999999, False, self.tt, move_gen,
+                                   deadline=deadline, stats=stats, cancel=cancel)
+        best_state = children[0]
+        if len(children) == 1:
+            return best_value, best_state
+
+        generation = self._next_generation(best_value)
+        futures = [self.pool.submit(_search_root_child, child, depth, move_gen, generation)
+                   for child in children[1:]]
+
+        # Rezultātus skatām gājienu secībā, lai izvēle nebūtu atkarīga no tā,
+        # kurš process pabeidza pirmais. Vērtība ir precīza tikai tad, ja tā
+        # pārsniedz alpha, ar kuru bērns tika meklēts.
+        from concurrent.futures import TimeoutError as FutureTimeout
+        try:
+            for child, future in zip(children[1:], futures):
+                while True:
+                    if cancel is not None and cancel.is_set():
+                        raise SearchTimeout()
+                    if deadline is not None and time.perf_counter() > deadline:
+                        raise SearchTimeout()
+                    try:
+                        result = future.result(timeout=self.POLL_INTERVAL)
+                        break
+                    except FutureTimeout:
+                        pass
+                value, alpha_used, child_stats = result
+                if stats is not None:
+                    stats.merge(child_stats)
+                if value > alpha_used and value > best_value:
+                    best_value = value
+                    best_state = child
+        finally:
+            # Pabeigta vai atcelta: nesāktos uzdevumus izmet, strādājošie apstāsies paši
+            self._next_generation(-999999)
+            for f in futures:
+                f.cancel()
+        return best_value, best_state
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+# -----------------------------
+# Monte Karlo koka meklēšana (MCTS/UCT)
+# -----------------------------
+# Koks netiek meklēts pilnā platumā: katrā iterācijā no saknes pa UCT formulu
+# nonāk līdz neizvērstai virsotnei, pievieno vienu bērnu, no tā izspēlē ātru
+# spēli līdz beigām (ar varbūtību epsilon nejaušs gājiens, citādi paņem lielāko
+# skaitli) un rezultātu (uzvara/neizšķirts/zaudējums) izplata atpakaļ uz sakni.
+# Iterāciju skaits nav atkarīgs no virknes garuma, tāpēc der arī garām virknēm.
+
+# Iterāciju skaits vienam gājienam, UCT izpētes konstante un nejaušo gājienu daļa
+MCTS_ITERATIONS = 5000
+MCTS_EXPLORATION = 1.4
+MCTS_EPSILON = 0.1
+
+class MCTSNode:
+    """
+    Koka virsotne. counts - atlikušie skaiti, diff - gājiena izdarītāja punkti
+    mīnus pretinieka punkti, move - gājiens no vecāka, wins - uzvaru summa
+    spēlētājam, kurš izdarīja move (neizšķirts 0.5), visits - apmeklējumi.
+    """
+    def __init__(self, counts, diff, move=None, parent=None):
+        self.counts = counts
+        self.diff = diff
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = legal_count_moves(counts)
+        self.visits = 0
+        self.wins = 0.0
+
+    def uct_child(self, exploration):
+        """Bērns ar lielāko UCT vērtību: vidējā uzvara + izpētes papildinājums."""
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.wins / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+class MCTS:
+    """
+    MCTS meklētājs ar koka atkārtotu izmantošanu: nākamajā gājienā, ja jaunā
+    pozīcija ir iepriekšējās saknes bērns vai mazbērns, turpina ar tā apakškoku.
+    """
+    def __init__(self, exploration=MCTS_EXPLORATION, epsilon=MCTS_EPSILON, seed=None):
+        import random
+        self.rng = random.Random(seed)
+        self.exploration = exploration
+        self.epsilon = epsilon
+        self.root = None
+        # Cik reizes koks izmantots atkārtoti
+        self.reused = 0
+
+    def _find_root(self, counts, diff):
+        """Iepriekšējā koka virsotne ar šo pozīciju (sakne, bērns vai mazbērns) vai None."""
+        nodes = [self.root] if self.root is not None else []
+        for _ in range(3):
+            for node in nodes:
+                if node.counts == counts and node.diff == diff:
+                    node.parent = None
+                    return node
+            nodes = [child for node in nodes for child in node.children]
+        return None
+
+    def search(self, counts, diff, iterations=MCTS_ITERATIONS, deadline=None, cancel=None, stats=None):
+        """
+        Meklē no skaitu vektora counts, kur diff ir gājiena izdarītāja punktu
+        pārsvars. Beidz pēc iterations iterācijām (None -> bez limita) vai, kad
+        pagājis deadline (time.perf_counter() laiks). Atgriež galveno variantu:
+        visvairāk apmeklēto gājienu virkni no saknes.
+        cancel (threading.Event) - ja uzstādīts, meklēšanu pārtrauc ar SearchTimeout.
+        stats (SearchStats) - nodes ir iterāciju skaits, max_depth - dziļākā izvēle kokā.
+        """
+        root = self._find_root(counts, diff)
+        if root is None:
+            root = MCTSNode(counts, diff)
+        else:
+            self.reused += 1
+        self.root = root
+
+        done = 0
+        while iterations is None or done < iterations:
+            if done > 0 and deadline is not None and time.perf_counter() > deadline:
+                break
+            if cancel is not None and cancel.is_set():
+                raise SearchTimeout()
+            node, depth = self._select(root)
+            self._backpropagate(node, self._rollout(node))
+            done += 1
+            if stats is not None:
+                stats.nodes += 1
+                stats.max_depth = max(stats.max_depth, depth)
+        return self.principal_variation()
+
+    def principal_variation(self):
+        pv = []
+        node = self.root
+        while node is not None and node.children:
+            node = max(node.children, key=lambda child: child.visits)
+            pv.append(node.move)
+        return tuple(pv)
+
+    def _select(self, node):
+        """No saknes pa UCT līdz virsotnei ar neizmēģinātiem gājieniem un pievieno vienu bērnu."""
+        depth = 0
+        while not node.untried and node.children:
+            node = node.uct_child(self.exploration)
+            depth += 1
+        if node.untried:
+            move = node.untried.pop(0)
+            child_counts, points = apply_count_move(node.counts, move)
+            child = MCTSNode(child_counts, -(node.diff + points), move, node)
+            node.children.append(child)
+            node = child
+            depth += 1
+        return node, depth
+
+    def _rollout(self, node):
+        """Izspēlē līdz beigām; atgriež gala pārsvaru virsotnes gājiena izdarītājam."""
+        counts = list(node.counts)
+        rng = self.rng
+        value = 0
+        sign = 1
+        while any(counts):
+            legal = [move for move in MOVES if counts[move[1] - 1]]
+            # MOVES secībā pirmais atļautais gājiens ir lielākā skaitļa paņemšana
+            move = rng.choice(legal) if rng.random() < self.epsilon else legal[0]
+            action, val = move
+            counts[val - 1] -= 1
+            if action == "split":
+                counts[val // 2 - 1] += 2
+            value += sign * MOVE_POINTS[move]
+            sign = -sign
+        return node.diff + value
+
+    def _backpropagate(self, node, final_diff):
+        # Rezultāts tam, kurš izdarīja gājienu uz node (pretējs node gājiena izdarītājam)
+        result = 1.0 if final_diff < 0 else 0.5 if final_diff == 0 else 0.0
+        while node is not None:
+            node.visits += 1
+            node.wins += result
+            result = 1.0 - result
+            node = node.parent
+
+# -----------------------------
+# Dzinēja API (bez pygame loga)
+# -----------------------------
+class Engine:
+    """
+    Datora spēlētājs: izvēlas gājienu ar norādīto algoritmu.
+    Transpozīciju tabula un kārtošanas tabulas paliek starp gājieniem.
+    Der gan GameController, gan spēlēm bez loga (selfplay.py).
+    """
+    def __init__(self, algorithm=ALGO_MINIMAX, search_depth=3, time_budget_ms=500,
+                 tablebase=None, parallel_depth=10, parallel_workers=None, evaluator=None, book=None,
+                 trace_path=None, quiescence_nodes=QUIESCENCE_NODES, mcts_iterations=MCTS_ITERATIONS):
+        self.algorithm = algorithm
+        # Meklēšanas dziļums (koku dziļums) Minimax algoritmam
+        self.search_depth = search_depth
+        # Laiks (ms), ko Alpha-Beta (iteratīvā padziļināšana) un MCTS drīkst tērēt vienam gājienam
+        self.time_budget_ms = time_budget_ms
+        # Galotņu tabula precīzajam algoritmam (None -> izrēķina atmiņā)
+        self.tablebase = tablebase
+        # Paralēlās meklēšanas dziļums un procesu skaits (procesus palaiž pirmajā gājienā)
+        self.parallel_depth = parallel_depth
+        self.parallel_workers = parallel_workers or os.cpu_count() or 1
+        self.parallel_search = None
+        # Robežas novērtējums Minimax un Alpha-Beta meklēšanai (None -> tikai punktu starpība)
+        self.evaluator = evaluator
+        # Klusuma meklēšanas virsotņu limits Alpha-Beta robežā (0 -> bez klusuma meklēšanas)
+        self.quiescence_nodes = quiescence_nodes
+        # MCTS iterāciju skaits vienam gājienam (laiku ierobežo arī time_budget_ms);
+        # koks paliek starp gājieniem
+        self.mcts_iterations = mcts_iterations
+        self.mcts = None
+        # Atklātņu grāmata pirmajiem BOOK_PLIES gājieniem (None -> vienmēr meklē)
+        self.book = book
+        # JSONL fails, kurā pēc katra gājiena pieraksta meklēšanas statistiku (None -> nepieraksta)
+        self.trace_path = trace_path
+
+        # Transpozīciju tabulu (1 << 18 vietas) izveido tikai tad, kad to izmanto
+        # meklēšana (skatīt tt) - precīzajam algoritmam, MCTS un selfplay.py
+        # spēlētājiem tā nav vajadzīga
+        self._tt = None
+        self.ordering = MoveOrdering()
+        # Pēdējā gājiena meklēšanas statistika
+        self.last_stats = SearchStats()
+        # Pēdējā gājiena galvenais variants: (izvēlētais gājiens, sagaidāmā atbilde, ...)
+        self.last_pv = ()
+        # Domāšana pretinieka laikā: {vektors pēc pretinieka gājiena: (galvenais_variants, dziļums)}
+        self.ponder_results = {}
+        # Cik reizes pretinieks izdarīja gājienu, kuru domāšana bija izmeklējusi (un cik ne)
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+
+    @property
+    def tt(self):
+        """Transpozīciju tabula, kas paliek starp gājieniem (izveido pirmajā izmantošanā)."""
+        if self._tt is None:
+            self._tt = TranspositionTable(size=1 << 18)
+        return self._tt
+
+    def choose_move(self, numbers, my_score, opp_score, cancel=None, ply=None):
+        """
+        Atgriež gājienu (darbība, skaitlis) spēlētājam, kuram tagad jāiet,
+        vai None. Meklē pa skaitu vektoriem; gājiena izdarītājs meklēšanā ir AI.
+        ply - cik gājienu spēlē jau izdarīts; ja zināms, pirmajos BOOK_PLIES
+        gājienos vispirms skatās atklātņu grāmatā.
+        Meklēšanas statistika pēc tam ir last_stats (un trace_path failā, ja tas norādīts).
+        """
+        start = time.perf_counter()
+        move = self._choose_move(numbers, my_score, opp_score, cancel, ply)
+        self.last_stats.time = time.perf_counter() - start
+        if self.trace_path is not None:
+            import json
+            record = {"algorithm": self.algorithm, "numbers": list(numbers),
+                      "move": list(move) if move is not None else None}
+            record.update(self.last_stats.as_dict())
+            record.update(ponder_hits=self.ponder_hits, ponder_misses=self.ponder_misses)
+            with open(self.trace_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        return move
+
+    def _choose_move(self, numbers, my_score, opp_score, cancel, ply):
+        stats = SearchStats()
+        self.last_stats = stats
+        self.last_pv = ()
+        counts = to_counts(numbers)
+        if self.book is not None and ply is not None and ply < BOOK_PLIES:
+            move = self.book.lookup(counts, ply % 2)
+            if move is not None:
+                self.last_pv = (move,)
+                return move
+        if self.algorithm == ALGO_EXACT:
+            self.last_pv = exact_pv(counts, self.tablebase)
+            stats.nodes += 1
+            stats.max_depth = len(self.last_pv)
+            return self.last_pv[0] if self.last_pv else None
+
+        state = (counts, opp_score, my_score, AI)
+        if self.algorithm == ALGO_ALPHA_BETA:
+            pondered = self.ponder_results.get(counts)
+            if self.ponder_results:
+                if pondered is not None:
+                    self.ponder_hits += 1
+                else:
+                    self.ponder_misses += 1
+                self.ponder_results = {}
+            if pondered is not None and pondered[1] >= max_moves_left(counts):
+                # Pozīcija pretinieka laikā jau izmeklēta līdz galam
+                self.last_pv, stats.max_depth = pondered
+                return self.last_pv[0]
+            # Citādi meklē no jauna, bet domāšanas laikā aizpildītā tabula to paātrina
+            _, self.last_pv, stats.max_depth = iterative_deepening(
+                state, self.time_budget_ms, max_moves_left(counts), self.tt, self.ordering, stats, cancel,
+                evaluator=self.evaluator, quiescence_nodes=self.quiescence_nodes)
+        elif self.algorithm == ALGO_PARALLEL:
+            if self.parallel_search is None:
+                self.parallel_search = ParallelSearch(self.parallel_workers)
+            try:
+                _, best_state = self.parallel_search.search(state, self.parallel_depth, cancel=cancel,
+                                                            stats=stats)
+            except SearchTimeout:
+                return None
+            move = find_count_move(state, best_state)
+            self.last_pv = (move,) if move is not None else ()
+            stats.max_depth = self.parallel_depth
+        elif self.algorithm == ALGO_MCTS:
+            if self.mcts is None:
+                self.mcts = MCTS()
+            deadline = time.perf_counter() + self.time_budget_ms / 1000
+            try:
+                self.last_pv = self.mcts.search(counts, my_score - opp_score, self.mcts_iterations,
+                                                deadline, cancel, stats)
+            except SearchTimeout:
+                return None
+        elif _numpy() is not None:
+            # Minimax ar NumPy pa līmeņiem (tās pašas vērtības, bez rekursijas)
+            _, self.last_pv = batched_search(counts, self.search_depth, stats, self.evaluator)
+            stats.max_depth = self.search_depth
+        else:
+            board = SearchBoard.from_state(state)
+            _, self.last_pv = negamax(board, self.search_depth, tt=self.tt, stats=stats, pruning=False,
+                                      evaluator=self.evaluator)
+            stats.max_depth = self.search_depth
+        return self.last_pv[0] if self.last_pv else None
+
+    def ponder(self, numbers, cancel):
+        """
+        Domā pretinieka gājiena laikā (tikai Alpha-Beta): pēc kārtas meklē visas
+        pozīcijas pēc iespējamajiem pretinieka gājieniem ar dziļumu 1, 2, 3, ...
+        un rezultātus glabā kopīgajā transpozīciju tabulā un ponder_results.
+        numbers - virkne, no kuras jāiet pretiniekam. Beidz, kad uzstādīts cancel
+        (threading.Event) vai visas pozīcijas izmeklētas līdz galam.
+        """
+        self.ponder_results = {}
+        if self.algorithm != ALGO_ALPHA_BETA:
+            return
+        counts = to_counts(numbers)
+        children = []
+        for move in legal_count_moves(counts):
+            child, _ = apply_count_move(counts, move)
+            if any(child) and child not in children:
+                children.append(child)
+
+        for depth in range(1, max_moves_left(counts)):
+            for child in children:
+                if child in self.ponder_results and self.ponder_results[child][1] >= max_moves_left(child):
+                    continue
+                try:
+                    _, pv = negamax(SearchBoard.from_state((child, 0, 0, AI)), depth, tt=self.tt,
+                                    ordering=self.ordering, cancel=cancel, pvs=True,
+                                    evaluator=self.evaluator, quiescence_nodes=self.quiescence_nodes)
+                except SearchTimeout:
+                    return
+                self.ponder_results[child] = (pv, depth)
+
+    def shutdown(self):
+        """Aptur paralēlās meklēšanas procesus (ja tie bija palaisti)."""
+        if self.parallel_search is not None:
+            self.parallel_search.shutdown()
+            self.parallel_search = None
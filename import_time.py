@@ -0,0 +1,71 @@
+"""
+Moduļu importa laika mērījums.
+
+Katru moduli importē --runs reizes jaunā Python procesā un mēra tikai pašu
+importu (bez interpretatora palaišanas). Pirmais imports netiek skaitīts - tas
+izveido __pycache__, tāpēc mēra tā, kā modulis tiek importēts parasti.
+Pārbauda arī, ka engine neimportē pygame un NumPy, un beidzas ar kodu 1,
+ja engine imports ilgst vairāk par --max-ms.
+
+Lietošana:
+    python import_time.py
+    python import_time.py --runs 20 --max-ms 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Moduļi, kurus engine nedrīkst importēt
+HEAVY_MODULES = ("pygame", "numpy", "multiprocessing")
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed * 1000, *[name for name in {heavy!r} if name in sys.modules])
+"""
+
+def measure(module, runs):
+    """Atgriež (importa laiki ms, smagie moduļi, kas tika importēti)."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    code = PROBE.format(module=module, heavy=HEAVY_MODULES)
+    times = []
+    loaded = ()
+    for i in range(runs + 1):
+        out = subprocess.run([sys.executable, "-c", code], cwd=HERE, env=env,
+                             capture_output=True, text=True, check=True).stdout.split()
+        if i > 0:
+            times.append(float(out[0]))
+        loaded = out[1:]
+    return times, loaded
+
+def main():
+    parser = argparse.ArgumentParser(description="Mēra engine un spele importa laiku.")
+    parser.add_argument("--runs", type=int, default=10, help="mērījumu skaits katram modulim")
+    parser.add_argument("--max-ms", type=float, default=20.0, help="lielākais pieļaujamais engine importa laiks")
+    args = parser.parse_args()
+
+    failed = False
+    for module in ("engine", "spele"):
+        times, loaded = measure(module, args.runs)
+        print(f"{module:<8} mediāna {statistics.median(times):8.1f} ms, min {min(times):8.1f} ms"
+              + (f"  (importē: {', '.join(loaded)})" if loaded else ""))
+        if module == "engine":
+            if statistics.median(times) > args.max_ms:
+                print(f"engine imports ilgāks par {args.max_ms} ms", file=sys.stderr)
+                failed = True
+            if loaded:
+                print(f"engine importē {', '.join(loaded)}", file=sys.stderr)
+                failed = True
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Atklātņu grāmatas veidotājs.
+
+Katram sākuma skaitu vektoram ar virknes garumu --min-len..--max-len un katram
+vektoram pēc pirmā gājiena izrēķina labāko gājienu ar precīzo risinātāju un
+ieraksta tos JSON failā, ko GameController ielādē startējot.
+
+Lietošana:
+    python opening_book.py --output opening_book.json
+"""
+import argparse
+import time
+
+from engine import (
+    MAX_LEN, MIN_LEN, OPENING_BOOK_PATH, OpeningBook, apply_count_move, legal_count_moves, solve_exact,
+)
+
+def starting_counts(length):
+    """Visi skaitu vektori (c1, c2, c3, c4) ar c1 + c2 + c3 + c4 == length."""
+    for c4 in range(length + 1):
+        for c3 in range(length - c4 + 1):
+            for c2 in range(length - c4 - c3 + 1):
+                yield (length - c4 - c3 - c2, c2, c3, c4)
+
+def build_opening_book(min_len, max_len):
+    """Grāmata sākuma vektoriem (izdarītājs 0) un vektoriem pēc pirmā gājiena (izdarītājs 1)."""
+    book = OpeningBook()
+    for length in range(min_len, max_len + 1):
+        for counts in starting_counts(length):
+            book.add(counts, 0, solve_exact(counts)[1])
+            for move in legal_count_moves(counts):
+                child, _ = apply_count_move(counts, move)
+                if any(child):
+                    book.add(child, 1, solve_exact(child)[1])
+    return book
+
+def main():
+    parser = argparse.ArgumentParser(description="Izveido atklātņu grāmatu pirmajiem gājieniem.")
+    parser.add_argument("--min-len", type=int, default=MIN_LEN, help="mazākais virknes garums")
+    parser.add_argument("--max-len", type=int, default=MAX_LEN, help="lielākais virknes garums")
+    parser.add_argument("--output", default=OPENING_BOOK_PATH,
+                        help="faila ceļš (noklusējums opening_book.json blakus spele.py)")
+    args = parser.parse_args()
+
+    start = time.time()
+    book = build_opening_book(args.min_len, args.max_len)
+    book.save(args.output)
+    print(f"Ierakstīti {len(book.entries)} gājieni failā {args.output} ({time.time() - start:.1f} s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Spēles bez loga: dators pret datoru vai dators pret nejaušu spēlētāju.
+
+Katra spēle sākas ar virkni, kas ģenerēta no sava seed, tāpēc rezultāti ir
+atkārtojami. Spēles tiek spēlētas paralēli vairākos procesos, un rezultāti
+(uzvarētājs, punkti, gājienu skaits, apmeklētās virsotnes) tiek rakstīti
+JSONL vai CSV failā, tiklīdz spēle beigusies.
+
+Lietošana:
+    python selfplay.py --games 1000 --first exact --second random --output rezultati.jsonl
+    python selfplay.py --games 200 --first alpha_beta --second exact --budget-ms 20 --output r.csv
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import (
+    ALGO_ALPHA_BETA, ALGO_EXACT, ALGO_MCTS, ALGO_MINIMAX, MAX_LEN, MIN_LEN,
+    Engine, apply_action, is_game_over, legal_count_moves, load_tablebase, move_to_index, to_counts,
+)
+
+PLAYER_ALGORITHMS = {
+    "minimax": ALGO_MINIMAX,
+    "alpha_beta": ALGO_ALPHA_BETA,
+    "exact": ALGO_EXACT,
+    "mcts": ALGO_MCTS,
+}
+
+FIELDS = ["seed", "length", "first", "second", "winner",
+          "first_score", "second_score", "moves", "first_nodes", "second_nodes"]
+
+class RandomPlayer:
+    """Izvēlas nejaušu atļautu gājienu (ar savu seed)."""
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.last_nodes = 0
+
+    def choose_move(self, numbers, my_score, opp_score, cancel=None):
+        return self.rng.choice(legal_count_moves(to_counts(numbers)))
+
+def make_player(name, seed, depth, budget_ms, tablebase):
+    if name == "random":
+        return RandomPlayer(seed)
+    return Engine(PLAYER_ALGORITHMS[name], search_depth=depth, time_budget_ms=budget_ms,
+                  tablebase=tablebase)
+
+def play_game(seed, length, first, second, depth=3, budget_ms=50, tablebase=None):
+    """
+    Nospēlē vienu spēli. Pirmais gājienu izdara first.
+    Atgriež vārdnīcu ar FIELDS laukiem.
+    """
+    rng = random.Random(seed)
+    numbers = tuple(rng.randint(1, 4) for _ in range(length))
+    players = [make_player(first, seed, depth, budget_ms, tablebase),
+               make_player(second, seed + 1, depth, budget_ms, tablebase)]
+    scores = [0, 0]
+    nodes = [0, 0]
+    moves = 0
+    turn = 0
+
+    while not is_game_over(numbers):
+        player = players[turn]
+        move = player.choose_move(numbers, scores[turn], scores[1 - turn])
+        if isinstance(player, Engine):
+            nodes[turn] += player.last_stats.nodes
+        index = move_to_index(numbers, move)
+        numbers, points = apply_action(numbers, move[0], index)
+        scores[turn] += points
+        moves += 1
+        turn = 1 - turn
+
+    if scores[0] > scores[1]:
+        winner = "first"
+    elif scores[1] > scores[0]:
+        winner = "second"
+    else:
+        winner = "draw"
+    return {
+        "seed": seed, "length": length, "first": first, "second": second, "winner": winner,
+        "first_score": scores[0], "second_score": scores[1], "moves": moves,
+        "first_nodes": nodes[0], "second_nodes": nodes[1],
+    }
+
+# Katram darba procesam sava galotņu tabula (mmap lapas procesi izmanto kopīgi)
+_worker_tablebase = None
+
+def _init_worker():
+    global _worker_tablebase
+    _worker_tablebase = load_tablebase()
+
+def _play_job(job):
+    seed, length, first, second, depth, budget_ms = job
+    return play_game(seed, length, first, second, depth, budget_ms, _worker_tablebase)
+
+def main():
+    names = sorted(PLAYER_ALGORITHMS) + ["random"]
+    parser = argparse.ArgumentParser(description="Spēles bez loga (dators pret datoru).")
+    parser.add_argument("--games", type=int, default=100, help="spēļu skaits")
+    parser.add_argument("--seed", type=int, default=0, help="pirmās spēles seed (nākamās +1)")
+    parser.add_argument("--min-len", type=int, default=MIN_LEN, help="mazākais virknes garums")
+    parser.add_argument("--max-len", type=int, default=MAX_LEN, help="lielākais virknes garums")
+    parser.add_argument("--first", choices=names, default="exact", help="spēlētājs, kurš iet pirmais")
+    parser.add_argument("--second", choices=names, default="random", help="otrais spēlētājs")
+    parser.add_argument("--depth", type=int, default=3, help="Minimax meklēšanas dziļums")
+    parser.add_argument("--budget-ms", type=int, default=50, help="Alpha-Beta laiks vienam gājienam (ms)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="procesu skaits")
+    parser.add_argument("--output", default="-", help="rezultātu fails (.jsonl vai .csv), '-' -> stdout")
+    args = parser.parse_args()
+
+    jobs = []
+    for i in range(args.games):
+        seed = args.seed + i
+        length = random.Random(seed).randint(args.min_len, args.max_len)
+        jobs.append((seed, length, args.first, args.second, args.depth, args.budget_ms))
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    writer = None
+    if args.output.endswith(".csv"):
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+
+    wins = {"first": 0, "second": 0, "draw": 0}
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+        for result in pool.map(_play_job, jobs, chunksize=max(1, args.games // (args.workers * 8))):
+            wins[result["winner"]] += 1
+            if writer is not None:
+                writer.writerow(result)
+            else:
+                out.write(json.dumps(result) + "\n")
+    elapsed = time.time() - start
+
+    if out is not sys.stdout:
+        out.close()
+    print(f"{args.games} spēles {elapsed:.2f} s ({args.games / elapsed:.1f} spēles/s); "
+          f"{args.first}: {wins['first']}, {args.second}: {wins['second']}, neizšķirts: {wins['draw']}",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
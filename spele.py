@@ -1,8 +1,17 @@
 import pygame
 import sys
+import os
+import argparse
+import cProfile
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-pygame.init()
+from engine import (
+    AI, ALGO_ALPHA_BETA, ALGO_EXACT, ALGO_MCTS, ALGO_MINIMAX, ALGO_NAMES, ALGO_PARALLEL, HUMAN, LONG_MAX_LEN, MAX_LEN, MIN_LEN,
+    Engine, apply_action, describe_move, is_game_over, load_evaluator, load_opening_book,
+    load_tablebase, move_to_index,
+)
 
 # -----------------------------
 # Konstantes
@@ -15,156 +24,51 @@ BLACK = (0, 0, 0)
 GRAY  = (200, 200, 200)
 RED   = (255, 0, 0)
 
-FONT = pygame.font.SysFont(None, 30)
-BIG_FONT = pygame.font.SysFont(None, 50)
+# Virknes līdz MAX_LEN skaitļiem zīmē vienā rindā, garākas - režģī no šī y zem pogām
+GRID_TOP = 560
+# Statistikas pārklājuma augšmala (zem sagaidāmā turpinājuma, virs paziņojuma)
+STATS_TOP = 230
+
+# Jau uzzīmēto tekstu virsmas: (fonts, teksts, krāsa) -> pygame.Surface
+_TEXT_CACHE = {}
+_TEXT_CACHE_SIZE = 512
+
+def render_text(font, text, color):
+    """font.render(text, True, color) ar kešu - tas pats teksts netiek zīmēts atkārtoti."""
+    key = (font, text, color)
+    surface = _TEXT_CACHE.get(key)
+    if surface is None:
+        if len(_TEXT_CACHE) >= _TEXT_CACHE_SIZE:
+            _TEXT_CACHE.clear()  # mainīgie teksti (punkti, statistika) citādi krātos bez gala
+        surface = font.render(text, True, color)
+        _TEXT_CACHE[key] = surface
+    return surface
+
+# Fonti skaitļiem režģī: režģa solis -> pygame.font.Font
+_NUMBER_FONTS = {}
+
+def number_font(step):
+    """Fonts, kura cipari ietilpst režģa šūnā ar soli step (izveido vienreiz)."""
+    font = _NUMBER_FONTS.get(step)
+    if font is None:
+        font = pygame.font.SysFont(None, max(step, 10))
+        _NUMBER_FONTS[step] = font
+    return font
 
 # Spēles stāvokļi
 STATE_MENU = "MENU"
 STATE_GAME = "GAME"
 STATE_END  = "END"
 
-# Spēlētāji
-HUMAN = 0
-AI = 1
+# Vienas datora gājiena izvēles profils (taustiņš P spēles laikā)
+PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai_move.prof")
 
-# Atļautais virknes garums
-MIN_LEN = 15
-MAX_LEN = 20
-
-# -----------------------------
-# Loģikas funkcijas
-# -----------------------------
-
-def is_game_over(numbers):
-    """Pārbaudām, vai virkne ir tukša (vai spēle ir beigusies)."""
-    return len(numbers) == 0
-
-def evaluate(human_score, ai_score):
-    """
-    Novērtējuma funkcija: atgriež (ai_score - human_score).
-    Jo lielāka vērtība, jo labāk Datoram.
-    """
-    return ai_score - human_score
-
-def generate_all_moves(state):
-    """
-    Ģenerē visus iespējamos nākamos stāvokļus (pēc viena gājiena).
-    state = (numbers, human_score, ai_score, current_player)
-    """
-    (numbers, human_score, ai_score, current_player) = state
-    
-    # Nosakām, kuru spēlētāju punkti tiks mainīti
-    if current_player == HUMAN:
-        current_score = human_score
-        opp_score = ai_score
-        next_player = AI
-    else:
-        current_score = ai_score
-        opp_score = human_score
-        next_player = HUMAN
-
-    next_states = []
-    numbers_list = list(numbers)
-
-    for i, val in enumerate(numbers_list):
-        # 1) Paņemt skaitli (to noņem no virknes un pieskaita saviem punktiem)
-        new_nums = list(numbers_list)
-        del new_nums[i]
-        new_score = current_score + val
-        if current_player == HUMAN:
-            new_state = (tuple(new_nums), new_score, opp_score, next_player)
-        else:
-            new_state = (tuple(new_nums), opp_score, new_score, next_player)
-        next_states.append(new_state)
-
-        # 2) Ja val == 2, var sadalīt 2 -> (1,1) un punkti nemainās
-        if val == 2:
-            new_nums2 = list(numbers_list)
-            new_nums2[i] = 1
-            new_nums2.insert(i+1, 1)
-            if current_player == HUMAN:
-                new_state2 = (tuple(new_nums2), current_score, opp_score, next_player)
-            else:
-                new_state2 = (tuple(new_nums2), opp_score, current_score, next_player)
-            next_states.append(new_state2)
-
-        # 3) Ja val == 4, var sadalīt 4 -> (2,2) un +1 punkts
-        if val == 4:
-            new_nums4 = list(numbers_list)
-            new_nums4[i] = 2
-            new_nums4.insert(i+1, 2)
-            new_score4 = current_score + 1  # +1 punkts par sadalīšanu
-            if current_player == HUMAN:
-                new_state4 = (tuple(new_nums4), new_score4, opp_score, next_player)
-            else:
-                new_state4 = (tuple(new_nums4), opp_score, new_score4, next_player)
-            next_states.append(new_state4)
-    
-    return next_states
-
-def minimax(state, depth, maximizing_player):
-    """
-    Minimax algoritms (bez alpha-beta).
-    Atgriež (labākā_vērtība, labākais_stāvoklis).
-    """
-    (numbers, human_score, ai_score, current_player) = state
-
-    if is_game_over(numbers) or depth == 0:
-        return evaluate(human_score, ai_score), state
-
-    if maximizing_player:
-        best_value = -999999
-        best_state = None
-        for nxt in generate_all_moves(state):
-            val, _ = minimax(nxt, depth - 1, False)
-            if val > best_value:
-                best_value = val
-                best_state = nxt
-        return best_value, best_state
-    else:
-        best_value = 999999
-        best_state = None
-        for nxt in generate_all_moves(state):
-            val, _ = minimax(nxt, depth - 1, True)
-            if val < best_value:
-                best_value = val
-                best_state = nxt
-        return best_value, best_state
-
-def alpha_beta(state, depth, alpha, beta, maximizing_player):
-    """
-    Minimax ar alfa-beta griešanu.
-    Atgriež (labākā_vērtība, labākais_stāvoklis).
-    """
-    (numbers, human_score, ai_score, current_player) = state
-
-    if is_game_over(numbers) or depth == 0:
-        return evaluate(human_score, ai_score), state
-
-    if maximizing_player:
-        best_value = -999999
-        best_state = None
-        for nxt in generate_all_moves(state):
-            val, _ = alpha_beta(nxt, depth - 1, alpha, beta, False)
-            if val > best_value:
-                best_value = val
-                best_state = nxt
-            alpha = max(alpha, best_value)
-            if beta <= alpha:
-                break
-        return best_value, best_state
-    else:
-        best_value = 999999
-        best_state = None
-        for nxt in generate_all_moves(state):
-            val, _ = alpha_beta(nxt, depth - 1, alpha, beta, True)
-            if val < best_value:
-                best_value = val
-                best_state = nxt
-            beta = min(beta, best_value)
-            if beta <= alpha:
-                break
-        return best_value, best_state
+def profile_call(path, func, *args):
+    """Izsauc func(*args) ar cProfile un saglabā profilu failā path (skatīt ar pstats)."""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args)
+    profiler.dump_stats(path)
+    return result
 
 # -----------------------------
 # Galvenais kontrolieris
@@ -174,12 +78,18 @@ class GameController:
         self.message = ""
         self.message_timer = 0
         self.state = STATE_MENU
+        # pygame un fonti tiek inicializēti tikai tad, kad tiešām vajadzīgs logs
+        # (SysFont pārlūko visus sistēmas fontus, tas var aizņemt sekundes)
+        pygame.init()
+        self.font = pygame.font.SysFont(None, 30)
+        self.big_font = pygame.font.SysFont(None, 50)
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Spēle ar Minimax un Alpha-Beta")
+        # Peles kustība neko nemaina, tāpēc tās notikumi nav vajadzīgi
+        pygame.event.set_blocked(pygame.MOUSEMOTION)
         
         # Parametri, ko izvēlamies izvēlnē
         self.seq_length = 15
-        self.use_alpha_beta = False  # False -> Minimax, True -> Alpha-Beta
         self.first_move_choice = 1   # 1=Cilvēks, 2=Dators, 3=Nejauši
 
         # Spēles dati
@@ -187,33 +97,100 @@ class GameController:
         self.human_score = 0
         self.ai_score = 0
         self.current_player = HUMAN
+        # Izdarīto gājienu skaits (atklātņu grāmatai)
+        self.ply = 0
 
         # Lai zinātu, kuru skaitli cilvēks ir izvēlējies
         self.selected_index = None
 
-        # Meklēšanas dziļums (koku dziļums)
-        self.search_depth = 3  # Var mainīt pēc vajadzības
+        # Skaitļu un pogu taisnstūri (nemainās, tāpēc netiek veidoti katrā kadrā).
+        # Skaitļu izkārtojumu (kreisā mala, augša, solis, izmērs, kolonnas) un fontu
+        # izvēlas set_number_layout pēc virknes garuma.
+        self.number_rects = []
+        self.number_layout = (50, 120, 50, 40, LONG_MAX_LEN)
+        self.number_font = self.font
+        self.btn_take = pygame.Rect(50, 500, 100, 40)
+        self.btn_split = pygame.Rect(200, 500, 120, 40)
+        # Datora sagaidāmais turpinājums (galvenais variants pēc tā gājiena)
+        self.expected_line = ()
+
+        # Datora dzinējs (algoritms un tā iestatījumi tiek izvēlēti izvēlnē)
+        self.engine = Engine(tablebase=load_tablebase(), evaluator=load_evaluator(),
+                             book=load_opening_book())
+
+        # Datora meklēšana notiek fona pavedienā, lai logs nesastingtu
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.ai_future = None
+        self.ai_cancel = None
+        # Meklēšanas statistikas rādīšana un nākamā datora gājiena profilēšana
+        self.show_stats = False
+        self.profile_next = False
+        self.profile_path = PROFILE_PATH
+
+        # Cilvēka gājiena laikā tajā pašā pavedienā dators domā uz priekšu
+        self.ponder_future = None
+        self.ponder_cancel = None
 
     def run(self):
         clock = pygame.time.Clock()
 
+        # Ekrānu zīmē no jauna tikai tad, ja mainījies tas, kas uz tā redzams
+        # (frame_key), vai ir notikumi (piem., logs atkal redzams)
+        last_frame = None
         running = True
         while running:
             clock.tick(30)  # FPS
+            if self.message_timer > 0:
+                self.message_timer -= 1
+            redraw = pygame.event.peek()
             if self.state == STATE_MENU:
                 self.handle_menu_events()
-                self.draw_menu()
             elif self.state == STATE_GAME:
                 self.handle_game_events()
-                self.draw_game()
             elif self.state == STATE_END:
                 self.handle_end_events()
-                self.draw_end()
             else:
                 running = False
+                break
 
-            pygame.display.flip()
+            # Zīmē stāvokli pēc notikumu apstrādes - tā var būt mainījusi self.state
+            if self.state == STATE_MENU:
+                draw = self.draw_menu
+            elif self.state == STATE_GAME:
+                draw = self.draw_game
+            elif self.state == STATE_END:
+                draw = self.draw_end
+            else:
+                break
 
+            frame = self.frame_key()
+            if redraw or frame != last_frame:
+                draw()
+                pygame.display.flip()
+                last_frame = frame
+
+        self.quit()
+
+    def frame_key(self):
+        """Viss, no kā atkarīgs pašreizējā stāvokļa attēls; ja tas nav mainījies, nezīmē."""
+        message = self.message if self.message_timer > 0 else None
+        if self.state == STATE_MENU:
+            return (self.state, self.seq_length, self.engine.algorithm, self.first_move_choice)
+        if self.state == STATE_GAME:
+            # Datora domāšanas punkti mainās ik pēc 300 ms
+            thinking = pygame.time.get_ticks() // 300 % 4 if self.current_player == AI else None
+            stats = None
+            if self.show_stats:
+                stats = (self.engine.last_stats.as_dict(), self.engine.ponder_hits, self.engine.ponder_misses)
+            return (self.state, tuple(self.numbers), self.human_score, self.ai_score, self.current_player,
+                    self.selected_index, thinking, message, self.expected_line, stats)
+        return (self.state, self.human_score, self.ai_score)
+
+    def quit(self):
+        """Atceļ datora meklēšanu (ja tā notiek) un aizver spēli."""
+        self.cancel_ai()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.engine.shutdown()
         pygame.quit()
         sys.exit()
 
@@ -223,19 +200,28 @@ class GameController:
     def handle_menu_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                self.quit()
             elif event.type == pygame.KEYDOWN:
-                # Bultiņas augšup/lejup maina virknes garumu
+                # Bultiņas augšup/lejup maina virknes garumu par 1, PAGEUP/PAGEDOWN - par 100
                 if event.key == pygame.K_UP:
-                    self.seq_length = min(self.seq_length + 1, MAX_LEN)
+                    self.seq_length = min(self.seq_length + 1, LONG_MAX_LEN)
                 elif event.key == pygame.K_DOWN:
                     self.seq_length = max(self.seq_length - 1, MIN_LEN)
-                # Skaitlis 1 vai 2 -> Minimax/Alpha-Beta
+                elif event.key == pygame.K_PAGEUP:
+                    self.seq_length = min(self.seq_length + 100, LONG_MAX_LEN)
+                elif event.key == pygame.K_PAGEDOWN:
+                    self.seq_length = max(self.seq_length - 100, MIN_LEN)
+                # Skaitlis 1..5 -> Minimax/Alpha-Beta/Precīzs/Paralēlais/MCTS
                 if event.key == pygame.K_1:
-                    self.use_alpha_beta = False
+                    self.engine.algorithm = ALGO_MINIMAX
                 elif event.key == pygame.K_2:
-                    self.use_alpha_beta = True
+                    self.engine.algorithm = ALGO_ALPHA_BETA
+                elif event.key == pygame.K_3:
+                    self.engine.algorithm = ALGO_EXACT
+                elif event.key == pygame.K_4:
+                    self.engine.algorithm = ALGO_PARALLEL
+                elif event.key == pygame.K_5:
+                    self.engine.algorithm = ALGO_MCTS
                 # F taustiņi (F1/F2/F3) lai izvēlētos, kurš iet pirmais
                 if event.key == pygame.K_F1:
                     self.first_move_choice = 1  # Cilvēks
@@ -249,14 +235,14 @@ class GameController:
 
     def draw_menu(self):
         self.screen.fill(WHITE)
-        title = BIG_FONT.render("Parametru izvēle", True, BLACK)
+        title = render_text(self.big_font, "Parametru izvēle", BLACK)
         self.screen.blit(title, (250, 50))
 
-        txt1 = FONT.render(f"Virknes garums: {self.seq_length}  (UP/DOWN taustiņi)", True, BLACK)
+        txt1 = render_text(self.font, f"Virknes garums: {self.seq_length}  (UP/DOWN, PAGEUP/PAGEDOWN taustiņi)", BLACK)
         self.screen.blit(txt1, (250, 120))
 
-        algo_str = "Alpha-Beta" if self.use_alpha_beta else "Minimax"
-        txt2 = FONT.render(f"Algoritms: {algo_str}  (1=Minimax, 2=Alpha-Beta)", True, BLACK)
+        algo_str = ALGO_NAMES[self.engine.algorithm]
+        txt2 = render_text(self.font, f"Algoritms: {algo_str}  (1=Minimax, 2=Alpha-Beta, 3=Precīzs, 4=Paralēlais, 5=MCTS)", BLACK)
         self.screen.blit(txt2, (250, 160))
 
         # Kurš gājiens pirmais
@@ -266,13 +252,12 @@ class GameController:
             mover_text = "Dators"
         else:
             mover_text = "Nejauši"
-        txt3 = FONT.render(
-            f"Pirmais gājiens: {mover_text}  (F1=Cilvēks, F2=Dators, F3=Nejauši)",
-            True, BLACK
+        txt3 = render_text(
+            self.font, f"Pirmais gājiens: {mover_text}  (F1=Cilvēks, F2=Dators, F3=Nejauši)", BLACK
         )
         self.screen.blit(txt3, (250, 200))
 
-        txt4 = FONT.render("Nospiediet ENTER, lai sāktu", True, RED)
+        txt4 = render_text(self.font, "Nospiediet ENTER, lai sāktu", RED)
         self.screen.blit(txt4, (250, 280))
 
     def start_game(self):
@@ -290,31 +275,62 @@ class GameController:
             # Nejaušs
             self.current_player = random.choice([HUMAN, AI])
 
+        self.ply = 0
+
         self.selected_index = None
+        self.expected_line = ()
+        self.set_number_layout()
         self.state = STATE_GAME
 
+    def set_number_layout(self):
+        """
+        Virkne līdz MAX_LEN - viena rinda ar 40x40 taisnstūriem zem punktiem. Garāka -
+        režģis zem pogām ar tik mazu soli, lai tajā ietilptu arī virkne pēc
+        sadalīšanām (ap 1,25 reizes garāka par sākotnējo).
+        """
+        self.number_rects = []
+        if len(self.numbers) <= MAX_LEN:
+            self.number_layout = (50, 120, 50, 40, LONG_MAX_LEN)
+            self.number_font = self.font
+            return
+        width = SCREEN_WIDTH - 100
+        height = SCREEN_HEIGHT - GRID_TOP - 20
+        cells = len(self.numbers) * 5 // 4
+        step = min(50, int((width * height / cells) ** 0.5))
+        while step > 4 and (width // step) * (height // step) < cells:
+            step -= 1
+        self.number_layout = (50, GRID_TOP, step, max(step - 2, 2), width // step)
+        self.number_font = number_font(step)
+
     # -----------------------------
     # Spēles stāvoklis (GAME)
     # -----------------------------
     def handle_game_events(self):
         if self.current_player == AI:
-            # Datora gājiens
-            pygame.time.wait(500)  # neliela pauze
-            self.ai_move()
-            # Pārbaudām, vai beigusies spēle
-            if is_game_over(self.numbers):
-                self.state = STATE_END
-            else:
-                self.current_player = HUMAN
-            return
+            self.poll_ai_move()
+        else:
+            self.start_ponder()
 
-        # Cilvēka gājiens: gaidām peles klikšķus
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                self.quit()
+
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                # ESC -> atpakaļ uz izvēlni (datora meklēšanu atceļ)
+                self.cancel_ai()
+                self.state = STATE_MENU
+                return
 
-            elif event.type == pygame.MOUSEBUTTONDOWN:
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_s:
+                # S -> rādīt/slēpt meklēšanas statistiku
+                self.show_stats = not self.show_stats
+
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+                # P -> nākamo datora gājienu izvēlas ar cProfile
+                self.profile_next = True
+
+            elif event.type == pygame.MOUSEBUTTONDOWN and self.current_player == HUMAN:
+                # Cilvēka gājiens: gaidām peles klikšķus
                 mx, my = event.pos
                 # Noskaidrojam, vai cilvēks noklikšķināja uz kāda skaitļa
                 index_clicked = self.get_number_index_by_pos(mx, my)
@@ -330,6 +346,7 @@ class GameController:
                     if action and self.selected_index is not None:
                         success = self.player_action(action, self.selected_index)  # ← JAUNA RINDIŅA
                         if success:
+                            self.stop_ponder()
                             if is_game_over(self.numbers):
                                 self.state = STATE_END
                             else:
@@ -341,70 +358,100 @@ class GameController:
         self.screen.fill(WHITE)
 
         # Punkti
-        score_text = FONT.render(
-            f"Punkti: Cilvēks={self.human_score} | Dators={self.ai_score}",
-            True, BLACK
+        score_text = render_text(
+            self.font, f"Punkti: Cilvēks={self.human_score} | Dators={self.ai_score}", BLACK
         )
         self.screen.blit(score_text, (20, 20))
 
         # Kurš gājiens?
         if self.current_player == HUMAN:
-            turn_text = FONT.render("Cilvēka gājiens", True, BLACK)
+            turn_text = render_text(self.font, "Cilvēka gājiens", BLACK)
         else:
-            turn_text = FONT.render("Datora gājiens (lūdzu, uzgaidiet...)", True, BLACK)
+            # Kamēr dators domā, punkti kustas, lai redzams, ka spēle nav sastingusi
+            dots = "." * (pygame.time.get_ticks() // 300 % 4)
+            turn_text = render_text(self.font, f"Datora gājiens (domā{dots})", BLACK)
         self.screen.blit(turn_text, (20, 60))
 
+        # Sagaidāmais turpinājums no datora meklēšanas (pirmais gājiens - cilvēka)
+        if self.current_player == HUMAN and self.expected_line:
+            players = ("cilvēks", "dators")
+            line = ", ".join(f"{players[i % 2]} {describe_move(move)}"
+                             for i, move in enumerate(self.expected_line[:6]))
+            if len(self.expected_line) > 6:
+                line += ", ..."
+            line_text = render_text(self.font, f"Sagaidāmais turpinājums: {line}", BLACK)
+            self.screen.blit(line_text, (20, 180))
+
         # Zīmējam virkni (skaitļus)
         self.draw_sequence()
 
         # Zīmējam darbību pogas
         self.draw_action_buttons()
         if self.message_timer > 0:
-            msg_text = FONT.render(self.message, True, RED)
+            msg_text = render_text(self.font, self.message, RED)
             self.screen.blit(msg_text, (50, 460))  # vai citu vietu, kur labi izskatās
-            self.message_timer -= 1
+
+        if self.show_stats:
+            self.draw_stats()
+
+    def draw_stats(self):
+        """
+        Pēdējā datora gājiena meklēšanas statistika starp sagaidāmo turpinājumu
+        (y=180) un paziņojumu (y=460) - tur nav ne skaitļu, ne pogu abos izkārtojumos.
+        """
+        stats = self.engine.last_stats
+        lines = [
+            f"Virsotnes: {stats.nodes} (klusuma: {stats.qnodes})",
+            f"Nogriešanas: {stats.cutoffs}",
+            f"TT trāpījumi: {stats.tt_hits}",
+            f"Dziļums: {stats.max_depth}",
+            f"Zarošanās: {stats.branching_factor:.2f}",
+            f"Laiks: {stats.time * 1000:.1f} ms",
+            f"Domāšana: trāpījumi {self.engine.ponder_hits}, garām {self.engine.ponder_misses}",
+        ]
+        for i, line in enumerate(lines):
+            text = render_text(self.font, line, BLACK)
+            self.screen.blit(text, (20, STATS_TOP + i * 25))
 
     def draw_sequence(self):
         """
         Uzzīmē skaitļu virkni.
-        Katrs skaitlis ir taisnstūris (40x40), atstarpe ~10px.
+        Katrs skaitlis ir taisnstūris (40x40, garām virknēm mazāks, skatīt set_number_layout).
         """
-        x_start = 50
-        y = 120
         for i, val in enumerate(self.numbers):
-            rect = pygame.Rect(x_start, y, 40, 40)
+            rect = self.number_rect(i)
             color = GRAY
             if i == self.selected_index:
                 color = (180, 180, 255)  # izcelts
             pygame.draw.rect(self.screen, color, rect)
-            num_text = FONT.render(str(val), True, BLACK)
+            num_text = render_text(self.number_font, str(val), BLACK)
             text_rect = num_text.get_rect(center=rect.center)
             self.screen.blit(num_text, text_rect)
-            x_start += 50
+
+    def number_rect(self, i):
+        """i-tā skaitļa taisnstūris (izveido vienreiz un glabā)."""
+        left, top, step, size, columns = self.number_layout
+        while len(self.number_rects) <= i:
+            row, column = divmod(len(self.number_rects), columns)
+            self.number_rects.append(pygame.Rect(left + step * column, top + step * row, size, size))
+        return self.number_rects[i]
 
     def get_number_index_by_pos(self, mx, my):
         """
         Noskaidro, kura skaitļa taisnstūrī ir klikšķis.
         Ja nav trāpīts, atgriež None.
         """
-        x_start = 50
-        y = 120
-        for i, val in enumerate(self.numbers):
-            rect = pygame.Rect(x_start, y, 40, 40)
-            if rect.collidepoint(mx, my):
+        for i in range(len(self.numbers)):
+            if self.number_rect(i).collidepoint(mx, my):
                 return i
-            x_start += 50
         return None
 
     def draw_action_buttons(self):
-        self.btn_take = pygame.Rect(50, 500, 100, 40)
-        self.btn_split = pygame.Rect(200, 500, 120, 40)
-
         pygame.draw.rect(self.screen, GRAY, self.btn_take)
         pygame.draw.rect(self.screen, GRAY, self.btn_split)
 
-        take_txt = FONT.render("Paņemt", True, BLACK)
-        split_txt = FONT.render("Split", True, BLACK)
+        take_txt = render_text(self.font, "Paņemt", BLACK)
+        split_txt = render_text(self.font, "Split", BLACK)
 
         self.screen.blit(take_txt, take_txt.get_rect(center=self.btn_take.center))
         self.screen.blit(split_txt, split_txt.get_rect(center=self.btn_split.center))
@@ -422,50 +469,100 @@ class GameController:
 
 
     def player_action(self, action, index):
-        val = self.numbers[index]
-        nums = list(self.numbers)
-
-        if action == "take":
-            self.human_score += val
-            del nums[index]
-            self.numbers = tuple(nums)
-            return True  # gājiens izdarīts
-
-        elif action == "split":
-            if val == 2:
-                nums[index] = 1
-                nums.insert(index+1, 1)
-                self.numbers = tuple(nums)
-                return True
-            elif val == 4:
-                nums[index] = 2
-                nums.insert(index+1, 2)
-                self.human_score += 1
-                self.numbers = tuple(nums)
-                return True
-            else:
-                self.message = "Šo skaitli nevar sadalīt"
+        result = apply_action(self.numbers, action, index)
+        if result is None:
+            self.message = "Šo skaitli nevar sadalīt"
+            self.message_timer = 90
+            return False  # Gājiens nav izdarīts
+
+        self.ply += 1
+        self.expected_line = ()
+        self.numbers, points = result
+        self.human_score += points
+        return True  # gājiens izdarīts
+
+    def choose_ai_move(self, numbers, human_score, ai_score, cancel=None, ply=None):
+        """
+        Izvēlas datora gājienu ar izvēlnē norādīto algoritmu (spēles sākumā -
+        no atklātņu grāmatas, ja tā ir). Spēles stāvokli nemaina, tāpēc to var
+        droši palaist fona pavedienā.
+        """
+        return self.engine.choose_move(numbers, ai_score, human_score, cancel, ply)
+
+    def apply_ai_move(self, move):
+        """Piemēro datora gājienu virknei un punktiem un nodod gājienu cilvēkam."""
+        if move is not None:
+            self.ply += 1
+            index = move_to_index(self.numbers, move)
+            self.numbers, points = apply_action(self.numbers, move[0], index)
+            self.ai_score += points
+            self.expected_line = self.engine.last_pv[1:]
+
+        # Pārbaudām, vai beigusies spēle
+        if is_game_over(self.numbers):
+            self.state = STATE_END
+        else:
+            self.current_player = HUMAN
+
+    def ai_move(self):
+        """Datora gājiens bez fona pavediena (izvēlas un uzreiz piemēro)."""
+        self.apply_ai_move(self.choose_ai_move(self.numbers, self.human_score, self.ai_score,
+                                               ply=self.ply))
+
+    def poll_ai_move(self):
+        """
+        Izsauc katrā kadrā datora gājiena laikā: ja meklēšana vēl nav sākta,
+        palaiž to fonā; ja tā ir beigusies, piemēro rezultātu.
+        """
+        if self.ai_future is None:
+            self.ai_cancel = threading.Event()
+            args = (tuple(self.numbers), self.human_score, self.ai_score, self.ai_cancel, self.ply)
+            if self.profile_next:
+                self.profile_next = False
+                self.ai_future = self.executor.submit(profile_call, self.profile_path, self.choose_ai_move, *args)
+                self.message = f"Profils saglabāts: {self.profile_path}"
                 self.message_timer = 90
-                return False  # Gājiens nav izdarīts
+            else:
+                self.ai_future = self.executor.submit(self.choose_ai_move, *args)
+            return
+
+        if not self.ai_future.done():
+            return
 
+        future = self.ai_future
+        self.ai_future = None
+        self.ai_cancel = None
+        # Gājienu piemēro galvenajā pavedienā starp kadriem, tāpēc zīmēšana
+        # nekad neredz pusmainītu stāvokli
+        self.apply_ai_move(future.result())
 
+    def start_ponder(self):
+        """Cilvēka gājiena laikā palaiž datora domāšanu fonā (ja tā vēl nenotiek)."""
+        if self.ponder_future is not None:
+            return
+        self.ponder_cancel = threading.Event()
+        self.ponder_future = self.executor.submit(self.engine.ponder, tuple(self.numbers), self.ponder_cancel)
 
-    def ai_move(self):
+    def stop_ponder(self):
         """
-        Datora gājiens, izmantojot Minimax vai Alpha-Beta (atkarībā no izvēles).
+        Aptur domāšanu. Nav jāgaida: izpildītājam ir viens pavediens, tāpēc
+        datora meklēšana sāksies tikai pēc tam, kad domāšana būs beigusies.
         """
-        state = (tuple(self.numbers), self.human_score, self.ai_score, AI)
-        if self.use_alpha_beta:
-            _, best_state = alpha_beta(state, self.search_depth, -999999, 999999, True)
-        else:
-            _, best_state = minimax(state, self.search_depth, True)
-
-        if best_state is None:
+        if self.ponder_future is None:
+            return
+        self.ponder_cancel.set()
+        self.ponder_future = None
+        self.ponder_cancel = None
+
+    def cancel_ai(self):
+        """Atceļ notiekošo datora meklēšanu; tās rezultāts tiek izmests."""
+        self.stop_ponder()
+        if self.ai_future is None:
             return
-        (numbers, h_score, a_score, next_player) = best_state
-        self.numbers = numbers
-        self.human_score = h_score
-        self.ai_score = a_score
+        self.ai_cancel.set()
+        self.ai_future.cancel()
+        self.ai_future = None
+        self.ai_cancel = None
 
     # -----------------------------
     # Spēles beigu ekrāns
@@ -473,8 +570,7 @@ class GameController:
     def handle_end_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                self.quit()
             elif event.type == pygame.KEYDOWN:
                 # Jebkurš taustiņš -> atpakaļ uz izvēlni
                 self.state = STATE_MENU
@@ -488,10 +584,10 @@ class GameController:
         elif self.ai_score > self.human_score:
             result_text = "Uzvar Dators!"
 
-        t1 = BIG_FONT.render("Spēle beigusies", True, RED)
-        t2 = FONT.render(f"Punkti: Cilvēks={self.human_score} | Dators={self.ai_score}", True, BLACK)
-        t3 = FONT.render(result_text, True, BLACK)
-        t4 = FONT.render("Nospiediet jebkuru taustiņu, lai atgrieztos izvēlnē", True, GRAY)
+        t1 = render_text(self.big_font, "Spēle beigusies", RED)
+        t2 = render_text(self.font, f"Punkti: Cilvēks={self.human_score} | Dators={self.ai_score}", BLACK)
+        t3 = render_text(self.font, result_text, BLACK)
+        t4 = render_text(self.font, "Nospiediet jebkuru taustiņu, lai atgrieztos izvēlnē", GRAY)
 
         self.screen.blit(t1, (250, 100))
         self.screen.blit(t2, (250, 200))
@@ -499,7 +595,18 @@ class GameController:
         self.screen.blit(t4, (100, 400))
 
 def main():
+    parser = argparse.ArgumentParser(description="Spēle ar Minimax un Alpha-Beta.")
+    parser.add_argument("--stats", action="store_true",
+                        help="rādīt meklēšanas statistiku (spēles laikā ieslēdz/izslēdz ar S)")
+    parser.add_argument("--trace", help="JSONL fails, kurā pierakstīt katra datora gājiena statistiku")
+    parser.add_argument("--profile", default=PROFILE_PATH,
+                        help="fails, kurā saglabāt profilu (spēles laikā taustiņš P profilē nākamo gājienu)")
+    args = parser.parse_args()
+
     game = GameController()
+    game.show_stats = args.stats
+    game.engine.trace_path = args.trace
+    game.profile_path = args.profile
     game.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,145 @@
+"""
+Galotņu tabulas veidotājs.
+
+Izrēķina precīzo vērtību un labāko gājienu katram skaitu vektoram, kas var
+rasties spēlē ar virknes garumu līdz --max-len, un ieraksta tos binārā failā,
+ko GameController atver ar mmap. Ja ir NumPy, tabulu izrēķina pa slāņiem ar
+engine.layered_tablebase, citādi ar build_tablebase. Ar --verify salīdzina
+tabulas vērtības ar closed_form slēgto formu.
+
+Lietošana:
+    python tablebase.py --max-len 20 --output tablebase.bin
+    python tablebase.py --max-len 20 --verify
+"""
+import argparse
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from engine import (
+    MAX_LEN, MOVES, TABLEBASE_PATH, TB_HEADER, TB_MAGIC, TB_NO_MOVE, TB_RECORD, TB_VERSION,
+    apply_count_move, closed_form, layered_tablebase, tablebase_dims,
+)
+
+def build_tablebase(max_len):
+    """
+    Aizpilda tabulu no apakšas uz augšu.
+    Katrs gājiens samazina ieraksta numuru, tāpēc, ejot pēc numuriem augošā
+    secībā, visu bērnu vērtības jau ir zināmas.
+    Atgriež (vērtības, gājienu_kodi) masīvus.
+    """
+    d4, d3, d2, d1 = tablebase_dims(max_len)
+    size = d4 * d3 * d2 * d1
+    values = array("h", bytes(2 * size))
+    moves = bytearray([TB_NO_MOVE]) * size
+
+    # Cik ieraksta numurs mainās, ja par vienu samazina c1, c2, c3 vai c4
+    stride = (1, d1, d1 * d2, d1 * d2 * d3)
+
+    # Katram gājienam: (kurš skaitlis jābūt, numura izmaiņa, punkti)
+    deltas = []
+    for action, val in MOVES:
+        if action == "take":
+            deltas.append((val, -stride[val - 1], val))
+        elif val == 2:
+            deltas.append((val, -stride[1] + 2 * stride[0], 0))
+        else:
+            deltas.append((val, -stride[3] + 2 * stride[1], 1))
+
+    for c4 in range(d4):
+        for c3 in range(max_len - c4 + 1):
+            for c2 in range(2 * max_len - 2 * (c3 + c4) + 1):
+                base = ((c4 * d3 + c3) * d2 + c2) * d1
+                for c1 in range(4 * max_len - 2 * c2 - 4 * (c3 + c4) + 1):
+                    if c1 == 0 and c2 == 0 and c3 == 0 and c4 == 0:
+                        continue
+                    counts = (c1, c2, c3, c4)
+                    index = base + c1
+                    best_value = None
+                    best_code = TB_NO_MOVE
+                    for code, (val, delta, points) in enumerate(deltas):
+                        if counts[val - 1] == 0:
+                            continue
+                        value = points - values[index + delta]
+                        if best_value is None or value > best_value:
+                            best_value = value
+                            best_code = code
+                    values[index] = best_value
+                    moves[index] = best_code
+
+    return values, moves
+
+def verify_tablebase(max_len, values, moves):
+    """
+    Pārbauda, ka closed_form dod tādu pašu vērtību kā tabula un ka tās gājiens
+    šo vērtību sasniedz. Atgriež (pārbaudīto ierakstu skaits, neatbilstības).
+    """
+    d4, d3, d2, d1 = tablebase_dims(max_len)
+    checked = 0
+    mismatches = []
+    for index, code in enumerate(moves):
+        if code == TB_NO_MOVE:
+            continue
+        rest, c1 = divmod(index, d1)
+        rest, c2 = divmod(rest, d2)
+        c4, c3 = divmod(rest, d3)
+        counts = (c1, c2, c3, c4)
+        value, move = closed_form(counts)
+        child, points = apply_count_move(counts, move)
+        child_value = closed_form(child)[0] if any(child) else 0
+        if value != values[index] or points - child_value != value:
+            mismatches.append((counts, values[index], value))
+        checked += 1
+    return checked, mismatches
+
+def write_tablebase(path, max_len, values, moves):
+    if np is not None and isinstance(values, np.ndarray):
+        # Tie paši TB_RECORD ieraksti (int16 + uint8 bez izlīdzināšanas) vienā masīvā
+        records = np.empty(len(moves), dtype=[("value", "<i2"), ("move", "u1")])
+        records["value"] = values
+        records["move"] = moves
+        with open(path, "wb") as f:
+            f.write(TB_HEADER.pack(TB_MAGIC, TB_VERSION, max_len))
+            f.write(records.tobytes())
+        return
+    data = bytearray(TB_HEADER.size + len(moves) * TB_RECORD.size)
+    TB_HEADER.pack_into(data, 0, TB_MAGIC, TB_VERSION, max_len)
+    offset = TB_HEADER.size
+    for value, code in zip(values, moves):
+        TB_RECORD.pack_into(data, offset, value, code)
+        offset += TB_RECORD.size
+    with open(path, "wb") as f:
+        f.write(data)
+
+def main():
+    parser = argparse.ArgumentParser(description="Izveido galotņu tabulu precīzajam algoritmam.")
+    parser.add_argument("--max-len", type=int, default=MAX_LEN,
+                        help=f"lielākais virknes garums (noklusējums {MAX_LEN})")
+    parser.add_argument("--output", default=TABLEBASE_PATH,
+                        help="faila ceļš (noklusējums tablebase.bin blakus spele.py)")
+    parser.add_argument("--verify", action="store_true",
+                        help="tikai salīdzina tabulu ar slēgto formu, failu neraksta")
+    args = parser.parse_args()
+
+    start = time.time()
+    if np is not None:
+        values, moves = layered_tablebase(args.max_len)
+    else:
+        values, moves = build_tablebase(args.max_len)
+    if args.verify:
+        checked, mismatches = verify_tablebase(args.max_len, values, moves)
+        for counts, table_value, value in mismatches[:10]:
+            print(f"{counts}: tabulā {table_value}, slēgtā forma {value}")
+        print(f"Pārbaudīti {checked} ieraksti, neatbilstības: {len(mismatches)} "
+              f"({time.time() - start:.1f} s)")
+        raise SystemExit(1 if mismatches else 0)
+    write_tablebase(args.output, args.max_len, values, moves)
+    print(f"Ierakstīti {len(moves)} ieraksti failā {args.output} "
+          f"({time.time() - start:.1f} s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Heiristiskā novērtējuma svaru pielāgošana.
+
+Savāc skaitu vektorus no nejaušām spēlēm (virknes garumi MIN_LEN..--max-len),
+katram izrēķina precīzo vērtību ar solve_exact un ar mazāko kvadrātu metodi
+pielāgo Evaluator svarus tā, lai novērtējums būtu pēc iespējas tuvāks precīzajai
+vērtībai. Pēc tam parāda, cik bieži meklēšana ar dziļumu 1..--depth izvēlas
+optimālu gājienu bez novērtējuma, ar to un ar klusuma meklēšanu robežā
+(bez novērtējuma). Vajag NumPy.
+
+Lietošana:
+    python tune_eval.py --samples 2000 --output evaluator.json
+"""
+import argparse
+import random
+
+import numpy as np
+
+from engine import (
+    AI, EVAL_FEATURES, EVALUATOR_PATH, MAX_LEN, MIN_LEN, QUIESCENCE_NODES, Evaluator, SearchBoard,
+    apply_count_move, eval_features, is_game_over, legal_count_moves, negamax, solve_exact, to_counts,
+)
+
+def sample_positions(samples, max_len, seed):
+    """Atšķirīgi skaitu vektori, kas rodas spēlēs ar nejaušiem gājieniem."""
+    rng = random.Random(seed)
+    positions = set()
+    for _ in range(samples):
+        counts = to_counts(rng.randint(1, 4) for _ in range(rng.randint(MIN_LEN, max_len)))
+        while not is_game_over(counts):
+            positions.add(counts)
+            counts, _ = apply_count_move(counts, rng.choice(legal_count_moves(counts)))
+    return sorted(positions)
+
+def fit_weights(positions):
+    """Mazāko kvadrātu svari: eval_features(counts) @ svari ~ solve_exact(counts)."""
+    features = np.array([eval_features(counts) for counts in positions], dtype=float)
+    values = np.array([solve_exact(counts)[0] for counts in positions], dtype=float)
+    weights, *_ = np.linalg.lstsq(features, values, rcond=None)
+    return Evaluator({name: round(float(w), 4) + 0.0 for name, w in zip(EVAL_FEATURES, weights)})
+
+def mean_error(positions, evaluator):
+    return sum(abs(evaluator.score(counts) - solve_exact(counts)[0]) for counts in positions) / len(positions)
+
+def optimal_move_rate(positions, depth, evaluator, quiescence_nodes=0):
+    """Cik daļā pozīciju meklēšana ar dziļumu depth izvēlas gājienu ar precīzo vērtību."""
+    optimal = 0
+    for counts in positions:
+        _, pv = negamax(SearchBoard.from_state((counts, 0, 0, AI)), depth, evaluator=evaluator,
+                        quiescence_nodes=quiescence_nodes)
+        child, points = apply_count_move(counts, pv[0])
+        if points - solve_exact(child)[0] == solve_exact(counts)[0]:
+            optimal += 1
+    return optimal / len(positions)
+
+def main():
+    parser = argparse.ArgumentParser(description="Pielāgo heiristiskā novērtējuma svarus.")
+    parser.add_argument("--samples", type=int, default=2000, help="nejaušo spēļu skaits")
+    parser.add_argument("--seed", type=int, default=0, help="nejaušo spēļu seed")
+    parser.add_argument("--max-len", type=int, default=MAX_LEN, help="lielākais virknes garums")
+    parser.add_argument("--depth", type=int, default=3, help="lielākais dziļums gājienu pārbaudei")
+    parser.add_argument("--output", default=EVALUATOR_PATH,
+                        help="svaru fails (noklusējums evaluator.json blakus spele.py)")
+    args = parser.parse_args()
+
+    positions = sample_positions(args.samples, args.max_len, args.seed)
+    evaluator = fit_weights(positions)
+    evaluator.save(args.output)
+
+    print(f"{len(positions)} pozīcijas, svari saglabāti: {args.output}")
+    for name in EVAL_FEATURES:
+        print(f"  {name:<12}{evaluator.weights[name]:>10.4f}")
+    print(f"Vidējā kļūda: bez novērtējuma {mean_error(positions, Evaluator()):.3f}, "
+          f"ar novērtējumu {mean_error(positions, evaluator):.3f}")
+    for depth in range(1, args.depth + 1):
+        print(f"Optimāli gājieni dziļumā {depth}: bez novērtējuma "
+              f"{optimal_move_rate(positions, depth, None):.1%}, "
+              f"ar novērtējumu {optimal_move_rate(positions, depth, evaluator):.1%}, "
+              f"ar klusuma meklēšanu {optimal_move_rate(positions, depth, None, QUIESCENCE_NODES):.1%}")
+
+if __name__ == "__main__":
+    main()